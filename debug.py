@@ -6,11 +6,22 @@ import pygame
 import numpy as np
 import random
 import math
+import array
 import json
-from collections import deque
 from enum import Enum
 from dataclasses import dataclass
 
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # Numba is optional; kernels fall back to plain Python
+    NUMBA_AVAILABLE = False
+    prange = range
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
 # Initialize Pygame
 pygame.init()
 SCREEN_WIDTH = 800
@@ -30,6 +41,57 @@ MARIO_GRAVITY = 0.45
 MARIO_MAX_FALL = 12.0
 MARIO_JUMP_HOLD_GRAVITY = 0.25  # Reduced gravity when holding jump
 
+TWO_PI = 2 * math.pi
+LEVEL_WIDTH = 5000
+GRID_CELL = 128  # Spatial hash cell size for collision broad-phase
+TRAIL_LENGTH = 15  # Frames of position history kept per particle
+
+# Whole-degree cos/sin lookup tables for cosmetic effects
+COS_TABLE = array.array('f', [math.cos(math.radians(i)) for i in range(360)])
+SIN_TABLE = array.array('f', [math.sin(math.radians(i)) for i in range(360)])
+
+# Particle draw radius indexed by remaining life (spawned at 255)
+PARTICLE_SIZE_LUT = np.maximum(1, np.arange(256) // 100).astype(np.int32)
+
+@njit('UniTuple(float64, 4)(float64, float64, float64, float64, boolean, boolean)', cache=True)
+def step_mario(vx, vy, px, py, on_ground, jump_held):
+    """Integrate one frame of Mario Forever physics, returning (vx, vy, px, py)"""
+    # Horizontal movement
+    target_speed = 0.0
+    
+    # Apply acceleration
+    if vx < target_speed:
+        vx = min(vx + MARIO_ACCELERATION, target_speed)
+    elif vx > target_speed:
+        vx = max(vx - MARIO_ACCELERATION, target_speed)
+    
+    # Apply friction
+    if on_ground:
+        if abs(vx) < MARIO_FRICTION:
+            vx = 0.0
+        else:
+            vx *= (1 - MARIO_FRICTION)
+    else:
+        vx *= (1 - MARIO_AIR_FRICTION)
+    
+    # Vertical movement (gravity)
+    if not on_ground:
+        # Variable jump height - less gravity when holding jump button
+        if jump_held and vy < 0:
+            vy += MARIO_JUMP_HOLD_GRAVITY
+        else:
+            vy += MARIO_GRAVITY
+        
+        # Terminal velocity
+        vy = min(vy, MARIO_MAX_FALL)
+    
+    # Update position, clamped to the level's left boundary
+    px += vx
+    py += vy
+    px = max(0.0, px)
+    
+    return vx, vy, px, py
+
 # Game States
 class GameState(Enum):
     WORLD_MAP = 1
@@ -50,14 +112,201 @@ class PowerUp(Enum):
     HAMMER = 4
     TANOOKI = 5
 
+# Body colors, looked up every frame by the renderer
+ENEMY_COLORS = {
+    'goomba': (150, 75, 0),
+    'koopa_green': (0, 200, 0),
+    'koopa_red': (200, 0, 0)
+}
+MARIO_COLORS = {
+    PowerUp.SMALL: (255, 0, 0),
+    PowerUp.SUPER: (255, 0, 0),
+    PowerUp.FIRE: (255, 100, 100),
+    PowerUp.BEET: (200, 0, 200),
+    PowerUp.HAMMER: (100, 100, 100),
+    PowerUp.TANOOKI: (150, 75, 0)
+}
+
+# ============= WORLD DEFINITIONS =============
+# All 8 worlds Mario Forever style (static, shared by every engine instance)
+WORLDS = {
+    1: {  # Grass Land
+        'name': 'Grass Land',
+        'theme': 'overworld',
+        'boss': 'Larry Koopa',
+        'time_limit': 400,
+        'levels': {
+            1: {'type': 'standard', 'exit_type': 'flag', 'bonus_areas': 2},
+            2: {'type': 'underground', 'exit_type': 'flag', 'bonus_areas': 1},
+            3: {'type': 'athletic', 'exit_type': 'flag', 'bonus_areas': 1},
+            4: {'type': 'fortress', 'exit_type': 'boss', 'bonus_areas': 0},
+            5: {'type': 'standard', 'exit_type': 'flag', 'bonus_areas': 3},
+            'castle': {'type': 'castle', 'exit_type': 'koopaling', 'bonus_areas': 0}
+        }
+    },
+    2: {  # Desert Land
+        'name': 'Desert Land',
+        'theme': 'desert',
+        'boss': 'Morton Koopa Jr.',
+        'time_limit': 400,
+        'levels': {
+            1: {'type': 'desert', 'exit_type': 'flag', 'angry_sun': True},
+            2: {'type': 'pyramid', 'exit_type': 'flag', 'bonus_areas': 2},
+            3: {'type': 'quicksand', 'exit_type': 'flag', 'bonus_areas': 1},
+            4: {'type': 'fortress', 'exit_type': 'boss', 'bonus_areas': 0},
+            5: {'type': 'oasis', 'exit_type': 'flag', 'bonus_areas': 1},
+            'castle': {'type': 'castle', 'exit_type': 'koopaling', 'bonus_areas': 0}
+        }
+    },
+    3: {  # Water Land
+        'name': 'Water Land',
+        'theme': 'ocean',
+        'boss': 'Wendy O. Koopa',
+        'time_limit': 400,
+        'levels': {
+            1: {'type': 'water', 'exit_type': 'flag', 'bonus_areas': 1},
+            2: {'type': 'bridge', 'exit_type': 'flag', 'bonus_areas': 2},
+            3: {'type': 'underwater', 'exit_type': 'pipe', 'bonus_areas': 1},
+            4: {'type': 'fortress', 'exit_type': 'boss', 'bonus_areas': 0},
+            5: {'type': 'island', 'exit_type': 'flag', 'bonus_areas': 2},
+            6: {'type': 'underwater', 'exit_type': 'flag', 'bonus_areas': 1},
+            'castle': {'type': 'castle', 'exit_type': 'koopaling', 'bonus_areas': 0}
+        }
+    },
+    4: {  # Giant Land
+        'name': 'Giant Land',
+        'theme': 'giant',
+        'boss': 'Iggy Koopa',
+        'time_limit': 400,
+        'levels': {
+            1: {'type': 'giant', 'exit_type': 'flag', 'bonus_areas': 2},
+            2: {'type': 'giant_enemies', 'exit_type': 'flag', 'bonus_areas': 1},
+            3: {'type': 'giant_blocks', 'exit_type': 'flag', 'bonus_areas': 2},
+            4: {'type': 'fortress', 'exit_type': 'boss', 'bonus_areas': 0},
+            5: {'type': 'giant_pipes', 'exit_type': 'flag', 'bonus_areas': 3},
+            'castle': {'type': 'castle', 'exit_type': 'koopaling', 'bonus_areas': 0}
+        }
+    },
+    5: {  # Sky Land
+        'name': 'Sky Land',
+        'theme': 'sky',
+        'boss': 'Roy Koopa',
+        'time_limit': 400,
+        'levels': {
+            1: {'type': 'clouds', 'exit_type': 'flag', 'bonus_areas': 2},
+            2: {'type': 'athletic', 'exit_type': 'flag', 'bonus_areas': 1},
+            3: {'type': 'tower', 'exit_type': 'door', 'bonus_areas': 2},
+            4: {'type': 'fortress', 'exit_type': 'boss', 'bonus_areas': 0},
+            5: {'type': 'airship', 'exit_type': 'pipe', 'bonus_areas': 1},
+            6: {'type': 'clouds', 'exit_type': 'flag', 'bonus_areas': 2},
+            'castle': {'type': 'castle', 'exit_type': 'koopaling', 'bonus_areas': 0}
+        }
+    },
+    6: {  # Ice Land
+        'name': 'Ice Land',
+        'theme': 'ice',
+        'boss': 'Lemmy Koopa',
+        'time_limit': 400,
+        'levels': {
+            1: {'type': 'ice', 'exit_type': 'flag', 'bonus_areas': 1},
+            2: {'type': 'cave', 'exit_type': 'flag', 'bonus_areas': 2},
+            3: {'type': 'slippery', 'exit_type': 'flag', 'bonus_areas': 1},
+            4: {'type': 'fortress', 'exit_type': 'boss', 'bonus_areas': 0},
+            5: {'type': 'frozen_pipes', 'exit_type': 'flag', 'bonus_areas': 2},
+            6: {'type': 'ice_bridge', 'exit_type': 'flag', 'bonus_areas': 1},
+            'castle': {'type': 'castle', 'exit_type': 'koopaling', 'bonus_areas': 0}
+        }
+    },
+    7: {  # Pipe Land
+        'name': 'Pipe Land',
+        'theme': 'pipes',
+        'boss': 'Ludwig von Koopa',
+        'time_limit': 400,
+        'levels': {
+            1: {'type': 'pipes', 'exit_type': 'flag', 'bonus_areas': 3},
+            2: {'type': 'maze', 'exit_type': 'flag', 'bonus_areas': 2},
+            3: {'type': 'underwater_pipes', 'exit_type': 'pipe', 'bonus_areas': 1},
+            4: {'type': 'fortress', 'exit_type': 'boss', 'bonus_areas': 0},
+            5: {'type': 'piranha_garden', 'exit_type': 'flag', 'bonus_areas': 2},
+            6: {'type': 'vertical', 'exit_type': 'flag', 'bonus_areas': 1},
+            'castle': {'type': 'castle', 'exit_type': 'koopaling', 'bonus_areas': 0}
+        }
+    },
+    8: {  # Dark Land
+        'name': 'Dark Land',
+        'theme': 'dark',
+        'boss': 'Bowser',
+        'time_limit': 500,
+        'levels': {
+            1: {'type': 'tanks', 'exit_type': 'flag', 'bonus_areas': 0},
+            2: {'type': 'fortress', 'exit_type': 'boss', 'bonus_areas': 0},
+            3: {'type': 'battleships', 'exit_type': 'flag', 'bonus_areas': 0},
+            4: {'type': 'fortress', 'exit_type': 'boss', 'bonus_areas': 0},
+            5: {'type': 'airforce', 'exit_type': 'flag', 'bonus_areas': 0},
+            'castle': {'type': 'bowser_castle', 'exit_type': 'bowser', 'bonus_areas': 0}
+        }
+    }
+}
+
 # ============= PHOTONIC ENGINE =============
+@njit(parallel=True, fastmath=True, cache=True)
+def step_particles(pos, vel, life, n, gravity, decay):
+    """Integrate the first n particles in place.
+    
+    Also returns the sum and sum of squares of the surviving particles'
+    coordinates so the spread can be read without another sweep.
+    """
+    total = 0.0
+    total_sq = 0.0
+    for i in prange(n):
+        pos[i, 0] += vel[i, 0]
+        pos[i, 1] += vel[i, 1]
+        vel[i, 1] += gravity
+        life[i] -= decay
+        if life[i] > 0:
+            x, y = pos[i, 0], pos[i, 1]
+            total += x + y
+            total_sq += x * x + y * y
+    return total, total_sq
+
+@njit(cache=True)
+def compact_particles(pos, vel, color, life, trails, n):
+    """Swap each dead particle with the last live one; returns the live count"""
+    i = 0
+    while i < n:
+        if life[i] <= 0:
+            n -= 1
+            pos[i] = pos[n]
+            vel[i] = vel[n]
+            color[i] = color[n]
+            life[i] = life[n]
+            trails[i] = trails[n]
+        else:
+            i += 1
+    return n
+
 class PhotonicGaussianEngine:
+    _kernel_cache = {}
+    
     def __init__(self):
-        self.particles = []
         self.gaussian_kernel = self._create_gaussian_kernel(5, 1.0)
-        self.splat_buffer = np.zeros((SCREEN_WIDTH, SCREEN_HEIGHT, 4))
         self.light_sources = []
         self.photon_limit = 10000
+        self.rng = np.random.default_rng()
+        
+        # Particle pool (structure of arrays); live particles occupy [0:n]
+        self.pos = np.zeros((self.photon_limit, 2), np.float32)
+        self.vel = np.zeros((self.photon_limit, 2), np.float32)
+        self.color = np.zeros((self.photon_limit, 3), np.uint8)
+        self.life = np.zeros(self.photon_limit, np.int16)
+        self.n = 0
+        
+        # Trail history ring buffer shared by all particles; trail_head is
+        # the slot the next frame's positions are written to. Trails are only
+        # ever needed to the pixel, so they are stored as int16.
+        self.trails = np.zeros((self.photon_limit, TRAIL_LENGTH, 2), np.int16)
+        self.trail_head = 0
+        self.spread = 0.0  # std of live particle coordinates, refreshed by update_particles
         self.evolution_params = {
             'mutation_rate': 0.1,
             'fitness_threshold': 0.7,
@@ -65,35 +314,85 @@ class PhotonicGaussianEngine:
         }
         
     def _create_gaussian_kernel(self, size, sigma):
-        kernel = np.zeros((size, size))
-        center = size // 2
-        for i in range(size):
-            for j in range(size):
-                x, y = i - center, j - center
-                kernel[i, j] = np.exp(-(x**2 + y**2) / (2 * sigma**2))
-        return kernel / kernel.sum()
+        # Size/sigma are fixed, so the kernel is built once per process
+        key = (size, sigma)
+        kernel = self._kernel_cache.get(key)
+        if kernel is None:
+            ax = np.arange(size) - size // 2
+            xx, yy = np.meshgrid(ax, ax, indexing='ij')
+            kernel = np.exp(-(xx * xx + yy * yy) / (2 * sigma * sigma))
+            kernel /= kernel.sum()
+            self._kernel_cache[key] = kernel
+        return kernel
+    
+    def _spawn(self, count, spread):
+        """Claim up to count free slots with random velocities and full life"""
+        start = self.n
+        end = start + max(0, min(count, self.photon_limit - start))
+        angle = self.rng.uniform(0, TWO_PI, end - start)
+        speed = self.rng.uniform(1, spread, end - start)
+        self.vel[start:end, 0] = np.cos(angle) * speed
+        self.vel[start:end, 1] = np.sin(angle) * speed
+        self.life[start:end] = 255
+        self.n = end
+        return slice(start, end)
     
     def emit_photon_burst(self, x, y, count, color, spread=10):
-        for _ in range(min(count, self.photon_limit - len(self.particles))):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(1, spread)
-            self.particles.append({
-                'pos': np.array([x, y], dtype=float),
-                'vel': np.array([math.cos(angle) * speed, math.sin(angle) * speed]),
-                'color': np.array(color),
-                'life': 255,
-                'trail': deque(maxlen=15),
-                'type': 'burst'
-            })
+        slots = self._spawn(count, spread)
+        self.pos[slots] = (x, y)
+        self.color[slots] = color
+        self.trails[slots] = self.pos[slots, None]
+    
+    def emit_bulk(self, xs, ys, colors, spread=10):
+        """Emit one photon per (x, y, color) row in a single vectorized pass"""
+        slots = self._spawn(len(xs), spread)
+        n = slots.stop - slots.start
+        self.pos[slots, 0] = xs[:n]
+        self.pos[slots, 1] = ys[:n]
+        self.color[slots] = colors[:n]
+        self.trails[slots] = self.pos[slots, None]
+    
+    def update_particles(self, gravity, decay):
+        """Integrate live particles and compact out the dead ones"""
+        n = self.n
+        if NUMBA_AVAILABLE:
+            total, total_sq = step_particles(self.pos, self.vel, self.life, n, gravity, decay)
+            self._record_trails()
+            self.n = compact_particles(self.pos, self.vel, self.color, self.life, self.trails, n)
+            count = 2 * self.n
+            if count:
+                mean = total / count
+                self.spread = math.sqrt(max(total_sq / count - mean * mean, 0.0))
+            return
+        
+        pos, vel, life = self.pos[:n], self.vel[:n], self.life[:n]
+        pos += vel
+        vel[:, 1] += gravity
+        life -= decay
+        self._record_trails()
+        
+        alive = life > 0
+        count = int(np.count_nonzero(alive))
+        if count < n:
+            for arr in (self.pos, self.vel, self.color, self.life, self.trails):
+                arr[:count] = arr[:n][alive]
+            self.n = count
+        if count:
+            self.spread = float(self.pos[:count].std())
+    
+    def _record_trails(self):
+        """Write this frame's positions into the trail ring buffer"""
+        self.trails[:self.n, self.trail_head] = self.pos[:self.n]
+        self.trail_head = (self.trail_head + 1) % TRAIL_LENGTH
     
     def evolve_particles(self):
-        if len(self.particles) > 100:
-            positions = np.array([p['pos'] for p in self.particles])
-            fitness = np.std(positions) / SCREEN_WIDTH
+        n = self.n
+        if n > 100:
+            fitness = self.spread / SCREEN_WIDTH
             
             if fitness < self.evolution_params['fitness_threshold']:
-                for particle in random.sample(self.particles, int(len(self.particles) * self.evolution_params['mutation_rate'])):
-                    particle['vel'] += np.random.randn(2) * 0.5
+                idx = self.rng.choice(n, int(n * self.evolution_params['mutation_rate']), replace=False)
+                self.vel[idx] += self.rng.standard_normal((len(idx), 2)) * 0.5
             
             self.evolution_params['generation'] += 1
 
@@ -104,7 +403,60 @@ class MarioForeverEngine:
         pygame.display.set_caption("Super Mario Bros 3: Mario Forever Community Edition")
         self.clock = pygame.time.Clock()
         self.photonic = PhotonicGaussianEngine()
+        self._build_assets()
+        
+        # Control settings (Mario Forever defaults)
+        self.controls = {
+            'left': pygame.K_LEFT,
+            'right': pygame.K_RIGHT,
+            'jump': pygame.K_z,  # Z key for jump
+            'run': pygame.K_x,   # X key for run/fire
+            'down': pygame.K_DOWN,
+            'up': pygame.K_UP,
+            'pause': pygame.K_ESCAPE
+        }
+        
+        # Alternative controls
+        self.alt_controls = {
+            'jump': [pygame.K_UP, pygame.K_w],  # Up arrow or W also jumps
+            'run': [pygame.K_LSHIFT, pygame.K_LCTRL]  # Shift/Ctrl also runs
+        }
+        self._alt_jump = tuple(self.alt_controls['jump'])
+        self._alt_run = tuple(self.alt_controls['run'])
         
+        # World definitions
+        self.worlds = WORLDS
+        
+        # Sound flags (for future implementation)
+        self.sounds_enabled = True
+        self.music_enabled = True
+        
+        self._reset_run_state()
+    
+    def _build_assets(self):
+        """Create fonts, sprites and other surfaces that outlive a single run"""
+        self.sky = self._build_sky()
+        self.font_small = pygame.font.Font(None, 24)
+        self.font_medium = pygame.font.Font(None, 32)
+        self.font_large = pygame.font.Font(None, 48)
+        self.font_huge = pygame.font.Font(None, 72)
+        self._text_cache = {}
+        self._build_digit_atlas()
+        self._build_hud()
+        self.question_surf = self.font_small.render("?", True, (255, 255, 255)).convert_alpha()
+        self._build_sprites()
+        
+        # Invincibility sparkles: fixed angular offsets and a cycling table of circle sprites
+        self._sparkle_angles = [i * 72 for i in range(5)]
+        self._sparkle_sprites = []
+        for _ in range(64):
+            # One 24-bit draw per color, each byte scaled into the 100-255 band
+            bits = random.getrandbits(24)
+            color = tuple(100 + (((bits >> shift) & 0xFF) * 156 >> 8) for shift in (0, 8, 16))
+            self._sparkle_sprites.append(self._circle_sprite(color, 3))
+    
+    def _reset_run_state(self):
+        """Start a fresh run: score, lives, Mario and level state; assets are kept"""
         # Game state
         self.state = GameState.WORLD_MAP
         self.current_world = 1
@@ -113,12 +465,23 @@ class MarioForeverEngine:
         self.coins = 0
         self.score = 0
         self.time = 400
+        self._time_accum_ms = 0  # Level time elapsed toward the next TIME tick
+        self._frame_ms = 0  # Duration of the previous frame, from clock.tick()
         self.paused = False
+        self.current_level_data = None
+        self.photonic.n = 0  # Drop particles left over from the previous run
+        
+        # Dirty-rect presentation: screen areas touched this frame and last,
+        # plus the camera position they were drawn at
+        self._dirty_rects = []
+        self._prev_dirty = []
+        self._camera_x = self._prev_camera_x = 0
+        self._full_redraw = True
         
         # Mario state - Mario Forever style
+        self.mario_px, self.mario_py = 100.0, 400.0
+        self.mario_vx, self.mario_vy = 0.0, 0.0
         self.mario = {
-            'pos': np.array([100.0, 400.0]),
-            'vel': np.array([0.0, 0.0]),
             'power': PowerUp.SMALL,
             'on_ground': False,
             'facing_right': True,
@@ -134,199 +497,15 @@ class MarioForeverEngine:
             'animation_frame': 0,
             'animation_timer': 0
         }
-        
-        # Control settings (Mario Forever defaults)
-        self.controls = {
-            'left': pygame.K_LEFT,
-            'right': pygame.K_RIGHT,
-            'jump': pygame.K_z,  # Z key for jump
-            'run': pygame.K_x,   # X key for run/fire
-            'down': pygame.K_DOWN,
-            'up': pygame.K_UP,
-            'pause': pygame.K_ESCAPE
-        }
-        
-        # Alternative controls
-        self.alt_controls = {
-            'jump': [pygame.K_UP, pygame.K_w],  # Up arrow or W also jumps
-            'run': [pygame.K_LSHIFT, pygame.K_LCTRL]  # Shift/Ctrl also runs
-        }
-        
-        # World definitions
-        self.worlds = self._define_worlds()
-        self.current_level_data = None
-        
-        # Sound flags (for future implementation)
-        self.sounds_enabled = True
-        self.music_enabled = True
-        
-    def _define_worlds(self):
-        """Define all 8 worlds Mario Forever style"""
-        return {
-            1: {  # Grass Land
-                'name': 'Grass Land',
-                'theme': 'overworld',
-                'boss': 'Larry Koopa',
-                'time_limit': 400,
-                'levels': {
-                    1: {'type': 'standard', 'exit_type': 'flag', 'bonus_areas': 2},
-                    2: {'type': 'underground', 'exit_type': 'flag', 'bonus_areas': 1},
-                    3: {'type': 'athletic', 'exit_type': 'flag', 'bonus_areas': 1},
-                    4: {'type': 'fortress', 'exit_type': 'boss', 'bonus_areas': 0},
-                    5: {'type': 'standard', 'exit_type': 'flag', 'bonus_areas': 3},
-                    'castle': {'type': 'castle', 'exit_type': 'koopaling', 'bonus_areas': 0}
-                }
-            },
-            2: {  # Desert Land
-                'name': 'Desert Land',
-                'theme': 'desert',
-                'boss': 'Morton Koopa Jr.',
-                'time_limit': 400,
-                'levels': {
-                    1: {'type': 'desert', 'exit_type': 'flag', 'angry_sun': True},
-                    2: {'type': 'pyramid', 'exit_type': 'flag', 'bonus_areas': 2},
-                    3: {'type': 'quicksand', 'exit_type': 'flag', 'bonus_areas': 1},
-                    4: {'type': 'fortress', 'exit_type': 'boss', 'bonus_areas': 0},
-                    5: {'type': 'oasis', 'exit_type': 'flag', 'bonus_areas': 1},
-                    'castle': {'type': 'castle', 'exit_type': 'koopaling', 'bonus_areas': 0}
-                }
-            },
-            3: {  # Water Land
-                'name': 'Water Land',
-                'theme': 'ocean',
-                'boss': 'Wendy O. Koopa',
-                'time_limit': 400,
-                'levels': {
-                    1: {'type': 'water', 'exit_type': 'flag', 'bonus_areas': 1},
-                    2: {'type': 'bridge', 'exit_type': 'flag', 'bonus_areas': 2},
-                    3: {'type': 'underwater', 'exit_type': 'pipe', 'bonus_areas': 1},
-                    4: {'type': 'fortress', 'exit_type': 'boss', 'bonus_areas': 0},
-                    5: {'type': 'island', 'exit_type': 'flag', 'bonus_areas': 2},
-                    6: {'type': 'underwater', 'exit_type': 'flag', 'bonus_areas': 1},
-                    'castle': {'type': 'castle', 'exit_type': 'koopaling', 'bonus_areas': 0}
-                }
-            },
-            4: {  # Giant Land
-                'name': 'Giant Land',
-                'theme': 'giant',
-                'boss': 'Iggy Koopa',
-                'time_limit': 400,
-                'levels': {
-                    1: {'type': 'giant', 'exit_type': 'flag', 'bonus_areas': 2},
-                    2: {'type': 'giant_enemies', 'exit_type': 'flag', 'bonus_areas': 1},
-                    3: {'type': 'giant_blocks', 'exit_type': 'flag', 'bonus_areas': 2},
-                    4: {'type': 'fortress', 'exit_type': 'boss', 'bonus_areas': 0},
-                    5: {'type': 'giant_pipes', 'exit_type': 'flag', 'bonus_areas': 3},
-                    'castle': {'type': 'castle', 'exit_type': 'koopaling', 'bonus_areas': 0}
-                }
-            },
-            5: {  # Sky Land
-                'name': 'Sky Land',
-                'theme': 'sky',
-                'boss': 'Roy Koopa',
-                'time_limit': 400,
-                'levels': {
-                    1: {'type': 'clouds', 'exit_type': 'flag', 'bonus_areas': 2},
-                    2: {'type': 'athletic', 'exit_type': 'flag', 'bonus_areas': 1},
-                    3: {'type': 'tower', 'exit_type': 'door', 'bonus_areas': 2},
-                    4: {'type': 'fortress', 'exit_type': 'boss', 'bonus_areas': 0},
-                    5: {'type': 'airship', 'exit_type': 'pipe', 'bonus_areas': 1},
-                    6: {'type': 'clouds', 'exit_type': 'flag', 'bonus_areas': 2},
-                    'castle': {'type': 'castle', 'exit_type': 'koopaling', 'bonus_areas': 0}
-                }
-            },
-            6: {  # Ice Land
-                'name': 'Ice Land',
-                'theme': 'ice',
-                'boss': 'Lemmy Koopa',
-                'time_limit': 400,
-                'levels': {
-                    1: {'type': 'ice', 'exit_type': 'flag', 'bonus_areas': 1},
-                    2: {'type': 'cave', 'exit_type': 'flag', 'bonus_areas': 2},
-                    3: {'type': 'slippery', 'exit_type': 'flag', 'bonus_areas': 1},
-                    4: {'type': 'fortress', 'exit_type': 'boss', 'bonus_areas': 0},
-                    5: {'type': 'frozen_pipes', 'exit_type': 'flag', 'bonus_areas': 2},
-                    6: {'type': 'ice_bridge', 'exit_type': 'flag', 'bonus_areas': 1},
-                    'castle': {'type': 'castle', 'exit_type': 'koopaling', 'bonus_areas': 0}
-                }
-            },
-            7: {  # Pipe Land
-                'name': 'Pipe Land',
-                'theme': 'pipes',
-                'boss': 'Ludwig von Koopa',
-                'time_limit': 400,
-                'levels': {
-                    1: {'type': 'pipes', 'exit_type': 'flag', 'bonus_areas': 3},
-                    2: {'type': 'maze', 'exit_type': 'flag', 'bonus_areas': 2},
-                    3: {'type': 'underwater_pipes', 'exit_type': 'pipe', 'bonus_areas': 1},
-                    4: {'type': 'fortress', 'exit_type': 'boss', 'bonus_areas': 0},
-                    5: {'type': 'piranha_garden', 'exit_type': 'flag', 'bonus_areas': 2},
-                    6: {'type': 'vertical', 'exit_type': 'flag', 'bonus_areas': 1},
-                    'castle': {'type': 'castle', 'exit_type': 'koopaling', 'bonus_areas': 0}
-                }
-            },
-            8: {  # Dark Land
-                'name': 'Dark Land',
-                'theme': 'dark',
-                'boss': 'Bowser',
-                'time_limit': 500,
-                'levels': {
-                    1: {'type': 'tanks', 'exit_type': 'flag', 'bonus_areas': 0},
-                    2: {'type': 'fortress', 'exit_type': 'boss', 'bonus_areas': 0},
-                    3: {'type': 'battleships', 'exit_type': 'flag', 'bonus_areas': 0},
-                    4: {'type': 'fortress', 'exit_type': 'boss', 'bonus_areas': 0},
-                    5: {'type': 'airforce', 'exit_type': 'flag', 'bonus_areas': 0},
-                    'castle': {'type': 'bowser_castle', 'exit_type': 'bowser', 'bonus_areas': 0}
-                }
-            }
-        }
     
     # ============= MARIO PHYSICS (MARIO FOREVER STYLE) =============
     def update_mario_physics(self):
         """Update Mario with Mario Forever physics"""
         
-        # Store previous position for collision detection
-        prev_pos = self.mario['pos'].copy()
-        
-        # Horizontal movement
-        target_speed = 0
-        if self.mario['running']:
-            max_speed = MARIO_RUN_SPEED
-        else:
-            max_speed = MARIO_WALK_SPEED
-        
-        # Apply acceleration
-        if self.mario['vel'][0] < target_speed:
-            self.mario['vel'][0] = min(self.mario['vel'][0] + MARIO_ACCELERATION, target_speed)
-        elif self.mario['vel'][0] > target_speed:
-            self.mario['vel'][0] = max(self.mario['vel'][0] - MARIO_ACCELERATION, target_speed)
-        
-        # Apply friction
-        if self.mario['on_ground']:
-            if abs(self.mario['vel'][0]) < MARIO_FRICTION:
-                self.mario['vel'][0] = 0
-            else:
-                self.mario['vel'][0] *= (1 - MARIO_FRICTION)
-        else:
-            self.mario['vel'][0] *= (1 - MARIO_AIR_FRICTION)
-        
-        # Vertical movement (gravity)
-        if not self.mario['on_ground']:
-            # Variable jump height - less gravity when holding jump button
-            if self.mario['jump_held'] and self.mario['vel'][1] < 0:
-                self.mario['vel'][1] += MARIO_JUMP_HOLD_GRAVITY
-            else:
-                self.mario['vel'][1] += MARIO_GRAVITY
-            
-            # Terminal velocity
-            self.mario['vel'][1] = min(self.mario['vel'][1], MARIO_MAX_FALL)
-        
-        # Update position
-        self.mario['pos'][0] += self.mario['vel'][0]
-        self.mario['pos'][1] += self.mario['vel'][1]
-        
-        # Level boundaries
-        self.mario['pos'][0] = max(0, self.mario['pos'][0])
+        self.mario_vx, self.mario_vy, self.mario_px, self.mario_py = step_mario(
+            self.mario_vx, self.mario_vy, self.mario_px, self.mario_py,
+            self.mario['on_ground'], self.mario['jump_held']
+        )
         
         # Check collisions
         self.check_collisions()
@@ -336,60 +515,131 @@ class MarioForeverEngine:
     
     def check_collisions(self):
         """Check Mario collisions with level geometry"""
-        if not self.current_level_data:
+        level = self.current_level_data
+        if not level:
             return
         
+        mario = self.mario
         mario_rect = self.get_mario_rect()
-        self.mario['on_ground'] = False
+        mario['on_ground'] = False
+        vx, vy = self.mario_vx, self.mario_vy
+        px, py = self.mario_px, self.mario_py
         
         # Platform collisions
-        for platform in self.current_level_data.get('platforms', []):
-            if platform['collision'] and mario_rect.colliderect(platform['rect']):
+        platforms = level['platforms']
+        plat_rects = level['plat_rects']
+        near = self._query_grid(level['platform_grid'], mario_rect)
+        for hit in mario_rect.collidelistall([plat_rects[i] for i in near]):
+            platform = platforms[near[hit]]
+            if platform['collision']:
+                rect = platform['rect']
                 # Landing on top
-                if self.mario['vel'][1] > 0 and mario_rect.bottom > platform['rect'].top:
-                    self.mario['pos'][1] = platform['rect'].top - mario_rect.height
-                    self.mario['vel'][1] = 0
-                    self.mario['on_ground'] = True
-                    self.mario['jump_timer'] = 0
+                if vy > 0 and mario_rect.bottom > rect.top:
+                    py = rect.top - mario_rect.height
+                    vy = 0.0
+                    mario['on_ground'] = True
+                    mario['jump_timer'] = 0
                 # Hitting from below
-                elif self.mario['vel'][1] < 0 and mario_rect.top < platform['rect'].bottom:
-                    self.mario['pos'][1] = platform['rect'].bottom
-                    self.mario['vel'][1] = 0
+                elif vy < 0 and mario_rect.top < rect.bottom:
+                    py = rect.bottom
+                    vy = 0.0
                 # Side collisions
-                elif self.mario['vel'][0] > 0 and mario_rect.right > platform['rect'].left:
-                    self.mario['pos'][0] = platform['rect'].left - mario_rect.width
-                    self.mario['vel'][0] = 0
-                elif self.mario['vel'][0] < 0 and mario_rect.left < platform['rect'].right:
-                    self.mario['pos'][0] = platform['rect'].right
-                    self.mario['vel'][0] = 0
+                elif vx > 0 and mario_rect.right > rect.left:
+                    px = rect.left - mario_rect.width
+                    vx = 0.0
+                elif vx < 0 and mario_rect.left < rect.right:
+                    px = rect.right
+                    vx = 0.0
         
         # Block collisions
-        for block in self.current_level_data.get('blocks', []):
-            if not block.get('hit', False) and mario_rect.colliderect(block['rect']):
+        blocks = level['blocks']
+        block_rects = level['block_rects']
+        near = self._query_grid(level['block_grid'], mario_rect)
+        for hit in mario_rect.collidelistall([block_rects[i] for i in near]):
+            block = blocks[near[hit]]
+            if not block['hit']:
                 # Hit from below
-                if self.mario['vel'][1] < 0 and mario_rect.top < block['rect'].bottom:
+                if vy < 0 and mario_rect.top < block['rect'].bottom:
                     self.hit_block(block)
-                    self.mario['pos'][1] = block['rect'].bottom
-                    self.mario['vel'][1] = 1  # Small bounce down
+                    py = block['rect'].bottom
+                    vy = 1.0  # Small bounce down
+        
+        self.mario_vx, self.mario_vy = vx, vy
+        self.mario_px, self.mario_py = px, py
         
         # Enemy collisions
-        for enemy in self.current_level_data.get('enemies', []):
-            enemy_rect = pygame.Rect(enemy['pos'][0], enemy['pos'][1], 30, 30)
-            if mario_rect.colliderect(enemy_rect):
-                if self.mario['invincible'] > 0:
-                    # Destroy enemy
-                    self.current_level_data['enemies'].remove(enemy)
-                    self.score += 100
-                    self.photonic.emit_photon_burst(enemy['pos'][0], enemy['pos'][1], 20, (255, 255, 0), 10)
-                elif self.mario['vel'][1] > 0 and mario_rect.bottom < enemy_rect.centery:
-                    # Stomp enemy
-                    self.current_level_data['enemies'].remove(enemy)
-                    self.score += 100
-                    self.mario['vel'][1] = -8  # Bounce
-                    self.photonic.emit_photon_burst(enemy['pos'][0], enemy['pos'][1], 15, (255, 100, 0), 8)
-                else:
-                    # Take damage
-                    self.damage_mario()
+        enemies = level['enemies']
+        enemy_rects = [pygame.Rect(e['pos'][0], e['pos'][1], 30, 30) for e in enemies]
+        killed = False
+        for hit in mario_rect.collidelistall(enemy_rects):
+            enemy, enemy_rect = enemies[hit], enemy_rects[hit]
+            if mario['invincible'] > 0:
+                # Destroy enemy
+                enemy['_dead'] = killed = True
+                self.score += 100
+                self.photonic.emit_photon_burst(enemy['pos'][0], enemy['pos'][1], 20, (255, 255, 0), 10)
+            elif self.mario_vy > 0 and mario_rect.bottom < enemy_rect.centery:
+                # Stomp enemy
+                enemy['_dead'] = killed = True
+                self.score += 100
+                self.mario_vy = -8.0  # Bounce
+                self.photonic.emit_photon_burst(enemy['pos'][0], enemy['pos'][1], 15, (255, 100, 0), 8)
+            else:
+                # Take damage
+                self.damage_mario()
+        
+        # Drop defeated enemies in one pass instead of list.remove() per hit
+        if killed:
+            enemies[:] = [e for e in enemies if not e.pop('_dead', False)]
+            self._pack_enemies(level)
+    
+    def _build_grid(self, objects):
+        """Bucket object indices by every GRID_CELL cell their rect overlaps"""
+        grid = {}
+        for i, obj in enumerate(objects):
+            rect = obj['rect']
+            for cx in range(rect.left // GRID_CELL, (rect.right - 1) // GRID_CELL + 1):
+                for cy in range(rect.top // GRID_CELL, (rect.bottom - 1) // GRID_CELL + 1):
+                    grid.setdefault((cx, cy), []).append(i)
+        return grid
+    
+    def _rect_array(self, objects):
+        """Stack object rects into an (N, 4) int32 array of x, y, w, h"""
+        return np.array([tuple(obj['rect']) for obj in objects], dtype=np.int32).reshape(-1, 4)
+    
+    def _visible(self, xywh, camera_x, margin):
+        """Indices of rects whose screen x lies within margin of the viewport"""
+        sx = xywh[:, 0] - camera_x
+        return sx, np.flatnonzero((sx > -margin) & (sx < SCREEN_WIDTH + margin))
+    
+    def _query_grid(self, grid, rect):
+        """Indices (in level order) of objects sharing a grid cell with rect"""
+        found = set()
+        for cx in range(rect.left // GRID_CELL, (rect.right - 1) // GRID_CELL + 1):
+            for cy in range(rect.top // GRID_CELL, (rect.bottom - 1) // GRID_CELL + 1):
+                found.update(grid.get((cx, cy), ()))
+        return sorted(found)
+    
+    def update_enemies(self):
+        """Advance every enemy along its patrol in one vectorized step"""
+        level = self.current_level_data
+        if not level:
+            return
+        
+        pos, vel, patrol = level['enemy_pos'], level['enemy_vel'], level['enemy_range']
+        pos += vel
+        vel[(pos[:, 0] < patrol[:, 0]) | (pos[:, 0] > patrol[:, 1]), 0] *= -1
+    
+    def _pack_enemies(self, level):
+        """Store enemy motion as arrays; each enemy's pos/vel become row views into them"""
+        enemies = level['enemies']
+        # float64 so indexed elements are Python floats that pygame.Rect accepts
+        level['enemy_pos'] = np.array([e['pos'] for e in enemies], np.float64).reshape(-1, 2)
+        level['enemy_vel'] = np.array([e['vel'] for e in enemies], np.float64).reshape(-1, 2)
+        level['enemy_range'] = np.array([e['patrol_range'] for e in enemies], np.float64).reshape(-1, 2)
+        for i, enemy in enumerate(enemies):
+            enemy['pos'] = level['enemy_pos'][i]
+            enemy['vel'] = level['enemy_vel'][i]
     
     def get_mario_rect(self):
         """Get Mario's collision rectangle"""
@@ -401,13 +651,13 @@ class MarioForeverEngine:
             if self.mario['ducking']:
                 height = 30
         
-        return pygame.Rect(self.mario['pos'][0], self.mario['pos'][1], width, height)
+        return pygame.Rect(int(self.mario_px), int(self.mario_py), width, height)
     
     def hit_block(self, block):
         """Handle block hit"""
         if block['type'] == 'question' and not block['hit']:
             block['hit'] = True
-            contents = block.get('contains', 'coin')
+            contents = block['contains']
             
             if contents == 'coin':
                 self.coins += 1
@@ -431,6 +681,11 @@ class MarioForeverEngine:
                 block['hit'] = True
                 self.score += 50
                 self.photonic.emit_photon_burst(block['rect'].centerx, block['rect'].centery, 25, (150, 75, 0), 12)
+        
+        if block['hit']:
+            # Hit blocks vanish, so repaint the scenery underneath
+            self._paint_scenery(self.current_level_data, block['rect'])
+            self._full_redraw = True
     
     def damage_mario(self):
         """Handle Mario taking damage"""
@@ -440,7 +695,7 @@ class MarioForeverEngine:
         if self.mario['power'] != PowerUp.SMALL:
             self.mario['power'] = PowerUp.SMALL
             self.mario['invincible'] = 120  # 2 seconds of invincibility
-            self.photonic.emit_photon_burst(self.mario['pos'][0], self.mario['pos'][1], 20, (255, 0, 0), 10)
+            self.photonic.emit_photon_burst(self.mario_px, self.mario_py, 20, (255, 0, 0), 10)
         else:
             self.lives -= 1
             if self.lives <= 0:
@@ -454,7 +709,7 @@ class MarioForeverEngine:
         self.mario['animation_timer'] += 1
         
         if self.mario['on_ground']:
-            if abs(self.mario['vel'][0]) > 0.5:
+            if abs(self.mario_vx) > 0.5:
                 # Walking/running animation
                 if self.mario['animation_timer'] % 8 == 0:
                     self.mario['animation_frame'] = (self.mario['animation_frame'] + 1) % 3
@@ -467,8 +722,8 @@ class MarioForeverEngine:
     
     def reset_level(self):
         """Reset current level"""
-        self.mario['pos'] = np.array([100.0, 400.0])
-        self.mario['vel'] = np.array([0.0, 0.0])
+        self.mario_px, self.mario_py = 100.0, 400.0
+        self.mario_vx, self.mario_vy = 0.0, 0.0
         self.mario['invincible'] = 0
         self.time = 400
         self.current_level_data = self.generate_level(self.current_world, self.current_level)
@@ -477,10 +732,11 @@ class MarioForeverEngine:
     def handle_input(self):
         """Handle input Mario Forever style"""
         keys = pygame.key.get_pressed()
+        controls = self.controls
         
         if self.state == GameState.LEVEL:
             # Pause
-            if keys[self.controls['pause']]:
+            if keys[controls['pause']]:
                 self.paused = not self.paused
                 return
             
@@ -489,17 +745,18 @@ class MarioForeverEngine:
             
             # Movement
             moving = False
-            if keys[self.controls['left']]:
-                self.mario['vel'][0] = -MARIO_WALK_SPEED if not self.mario['running'] else -MARIO_RUN_SPEED
+            if keys[controls['left']]:
+                self.mario_vx = -MARIO_WALK_SPEED if not self.mario['running'] else -MARIO_RUN_SPEED
                 self.mario['facing_right'] = False
                 moving = True
-            elif keys[self.controls['right']]:
-                self.mario['vel'][0] = MARIO_WALK_SPEED if not self.mario['running'] else MARIO_RUN_SPEED
+            elif keys[controls['right']]:
+                self.mario_vx = MARIO_WALK_SPEED if not self.mario['running'] else MARIO_RUN_SPEED
                 self.mario['facing_right'] = True
                 moving = True
             
             # Run button (also fire when powered up)
-            self.mario['running'] = keys[self.controls['run']] or any(keys[k] for k in self.alt_controls['run'])
+            alt_run = self._alt_run
+            self.mario['running'] = keys[controls['run']] or keys[alt_run[0]] or keys[alt_run[1]]
             
             if self.mario['running'] and self.mario['power'] == PowerUp.FIRE and self.mario['can_shoot']:
                 self.shoot_fireball()
@@ -507,21 +764,22 @@ class MarioForeverEngine:
                 self.mario['shoot_cooldown'] = 15
             
             # Jump button
-            jump_pressed = keys[self.controls['jump']] or any(keys[k] for k in self.alt_controls['jump'])
+            alt_jump = self._alt_jump
+            jump_pressed = keys[controls['jump']] or keys[alt_jump[0]] or keys[alt_jump[1]]
             
             if jump_pressed:
                 if self.mario['on_ground'] and not self.mario['jumping']:
                     # Start jump
-                    jump_power = MARIO_RUN_JUMP_POWER if abs(self.mario['vel'][0]) > MARIO_WALK_SPEED else MARIO_JUMP_POWER
-                    self.mario['vel'][1] = jump_power
+                    jump_power = MARIO_RUN_JUMP_POWER if abs(self.mario_vx) > MARIO_WALK_SPEED else MARIO_JUMP_POWER
+                    self.mario_vy = jump_power
                     self.mario['jumping'] = True
                     self.mario['jump_timer'] = 0
                     
                     # Jump particles
                     for i in range(8):
                         self.photonic.emit_photon_burst(
-                            self.mario['pos'][0] + 12,
-                            self.mario['pos'][1] + 30,
+                            self.mario_px + 12,
+                            self.mario_py + 30,
                             8, (200, 200, 100), 4
                         )
                 
@@ -531,14 +789,19 @@ class MarioForeverEngine:
                 self.mario['jump_held'] = False
             
             # Duck
-            self.mario['ducking'] = keys[self.controls['down']] and self.mario['on_ground']
+            self.mario['ducking'] = keys[controls['down']] and self.mario['on_ground']
             
             # Enter pipe
-            if keys[self.controls['down']] and self.mario['on_ground']:
+            if keys[controls['down']] and self.mario['on_ground']:
                 # Check if on pipe
-                for pipe in self.current_level_data.get('pipes', []):
-                    mario_rect = self.get_mario_rect()
-                    if pipe.get('enterable', False) and mario_rect.colliderect(pipe['rect']):
+                level = self.current_level_data
+                pipes = level['pipes']
+                pipe_rects = level['pipe_rects']
+                mario_rect = self.get_mario_rect()
+                near = self._query_grid(level['pipe_grid'], mario_rect)
+                for hit in mario_rect.collidelistall([pipe_rects[i] for i in near]):
+                    pipe = pipes[near[hit]]
+                    if pipe['enterable']:
                         self.enter_pipe(pipe)
             
             # Shoot cooldown
@@ -557,8 +820,8 @@ class MarioForeverEngine:
             return
         
         direction = 1 if self.mario['facing_right'] else -1
-        fireball_x = self.mario['pos'][0] + (24 if direction > 0 else 0)
-        fireball_y = self.mario['pos'][1] + 20
+        fireball_x = self.mario_px + (24 if direction > 0 else 0)
+        fireball_y = self.mario_py + 20
         
         # Create fireball entity (simplified)
         self.photonic.emit_photon_burst(fireball_x, fireball_y, 15, (255, 100, 0), 6)
@@ -569,13 +832,14 @@ class MarioForeverEngine:
         # Teleport to bonus area or different location
         # Simplified for this version
         self.photonic.emit_photon_burst(
-            self.mario['pos'][0], self.mario['pos'][1],
+            self.mario_px, self.mario_py,
             20, (0, 255, 0), 8
         )
     
     # ============= LEVEL GENERATION =============
-    def generate_level(self, world_num, level_num):
-        """Generate a Mario Forever style level"""
+    def generate_level(self, world_num, level_num, seed=None):
+        """Generate a Mario Forever style level (reproducible when seeded)"""
+        self._full_redraw = True
         level = {
             'platforms': [],
             'enemies': [],
@@ -587,10 +851,31 @@ class MarioForeverEngine:
             'exit': None
         }
         
+        # Draw every random decision for all ground slots up front
+        rng = np.random.default_rng(seed)
+        slots = range(0, LEVEL_WIDTH, 200)
+        n = len(slots)
+        gap = rng.random(n) > 0.8
+        floating = rng.random(n) > 0.6
+        plat_ys = rng.integers(300, 451, n)
+        has_blocks = rng.random(n) > 0.7
+        block_ys = rng.integers(300, 401, n)
+        block_counts = rng.integers(1, 5, n)
+        block_contents = rng.integers(0, 4, (n, 4))
+        has_enemy = rng.random(n) > 0.5
+        enemy_types = rng.integers(0, 3, n)
+        enemy_offsets = rng.integers(20, 181, n)
+        has_pipe = rng.random(n) > 0.8
+        pipe_heights = rng.integers(60, 151, n)
+        pipe_enterable = rng.random(n) > 0.5
+        
+        contents = ('coin', 'mushroom', 'flower', 'star')
+        enemy_kinds = ('goomba', 'koopa_green', 'koopa_red')
+        
         # Ground generation
-        for x in range(0, 5000, 200):
+        for s, x in enumerate(slots):
             # Random gaps
-            if random.random() > 0.8:
+            if gap[s]:
                 continue
             
             level['platforms'].append({
@@ -600,41 +885,40 @@ class MarioForeverEngine:
             })
             
             # Floating platforms
-            if random.random() > 0.6:
-                plat_y = random.randint(300, 450)
+            if floating[s]:
                 level['platforms'].append({
-                    'rect': pygame.Rect(x + 50, plat_y, 100, 20),
+                    'rect': pygame.Rect(x + 50, int(plat_ys[s]), 100, 20),
                     'type': 'floating',
                     'collision': True
                 })
             
             # Question blocks
-            if random.random() > 0.7:
-                block_y = random.randint(300, 400)
-                for i in range(random.randint(1, 4)):
+            if has_blocks[s]:
+                block_y = int(block_ys[s])
+                for i in range(block_counts[s]):
                     level['blocks'].append({
                         'rect': pygame.Rect(x + i*40, block_y, 32, 32),
                         'type': 'question',
-                        'contains': random.choice(['coin', 'mushroom', 'flower', 'star']),
+                        'contains': contents[block_contents[s, i]],
                         'hit': False
                     })
             
             # Enemies
-            if random.random() > 0.5:
+            if has_enemy[s]:
                 level['enemies'].append({
-                    'type': random.choice(['goomba', 'koopa_green', 'koopa_red']),
-                    'pos': [x + random.randint(20, 180), 470],
+                    'type': enemy_kinds[enemy_types[s]],
+                    'pos': [x + int(enemy_offsets[s]), 470],
                     'vel': [-1, 0],
                     'patrol_range': [x, x + 200]
                 })
             
             # Pipes
-            if random.random() > 0.8:
-                pipe_height = random.randint(60, 150)
+            if has_pipe[s]:
+                pipe_height = int(pipe_heights[s])
                 level['pipes'].append({
                     'rect': pygame.Rect(x + 100, 500 - pipe_height, 64, pipe_height),
                     'type': 'green',
-                    'enterable': random.random() > 0.5,
+                    'enterable': bool(pipe_enterable[s]),
                     'destination': 'bonus'
                 })
         
@@ -644,9 +928,115 @@ class MarioForeverEngine:
             'type': 'flag'
         }
         
+        self._pack_enemies(level)
+        
+        # Collision broad-phase for static geometry
+        level['plat_rects'] = [p['rect'] for p in level['platforms']]
+        level['block_rects'] = [b['rect'] for b in level['blocks']]
+        level['pipe_rects'] = [p['rect'] for p in level['pipes']]
+        level['platform_grid'] = self._build_grid(level['platforms'])
+        level['block_grid'] = self._build_grid(level['blocks'])
+        level['pipe_grid'] = self._build_grid(level['pipes'])
+        
+        # Geometry as (x, y, w, h) arrays for vectorized camera culling
+        level['plat_xywh'] = self._rect_array(level['platforms'])
+        level['plat_colors'] = np.array(
+            [(139, 69, 19) if p['type'] == 'ground' else (150, 150, 150) for p in level['platforms']],
+            dtype=np.uint8
+        ).reshape(-1, 3)
+        
+        # Static scenery pre-rendered once into a level-wide strip
+        level['background'] = pygame.Surface((LEVEL_WIDTH, SCREEN_HEIGHT)).convert()
+        self._paint_scenery(level, level['background'].get_rect())
+        
         return level
     
     # ============= RENDERING =============
+    def _build_sky(self):
+        """Pre-render the static sky gradient into a surface"""
+        sky = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+        pixels = pygame.surfarray.pixels3d(sky)
+        pixels[:, :, 0] = 100
+        pixels[:, :, 1] = 150
+        pixels[:, :, 2] = np.minimum(255, 100 + np.arange(SCREEN_HEIGHT) // 4)
+        del pixels  # Release the surface lock
+        return sky
+    
+    def _build_sprites(self):
+        """Pre-render block and pipe tiles so rendering is a single blit each"""
+        self.spr_question = self._bordered_tile((32, 32), (255, 200, 0), (200, 150, 0), 2)
+        self.spr_question.blit(self.question_surf, (10, 4))
+        self.spr_brick = self._bordered_tile((32, 32), (150, 75, 0), (100, 50, 0), 2)
+        self.spr_pipe_top = self._bordered_tile((80, 32), (0, 200, 0), (0, 150, 0), 3)
+        self.spr_pipe_bodies = {}
+        
+        # Enemy bodies with their eyes baked in
+        self.spr_enemies = {kind: self._enemy_tile(color) for kind, color in ENEMY_COLORS.items()}
+        self.spr_enemy_default = self._enemy_tile((100, 100, 100))
+        self.spr_particles = {}
+    
+    def _enemy_tile(self, color):
+        tile = pygame.Surface((30, 30)).convert()
+        tile.fill(color)
+        for eye_x in (8, 22):
+            pygame.draw.circle(tile, (255, 255, 255), (eye_x, 10), 4)
+            pygame.draw.circle(tile, (0, 0, 0), (eye_x, 10), 2)
+        return tile
+    
+    def _particle_sprite(self, key):
+        """Circle sprite for a packed (color, radius) particle key, built on first use"""
+        color = ((key >> 18) & 255, (key >> 10) & 255, (key >> 2) & 255)
+        sprite = self.spr_particles[key] = self._circle_sprite(color, key & 3)
+        return sprite
+    
+    def _circle_sprite(self, color, radius):
+        """Colorkeyed sprite of a filled circle, centered at (radius, radius)"""
+        transparent = (0, 0, 0) if color != (0, 0, 0) else (255, 0, 255)
+        sprite = pygame.Surface((2 * radius + 1, 2 * radius + 1)).convert()
+        sprite.fill(transparent)
+        sprite.set_colorkey(transparent, pygame.RLEACCEL)
+        pygame.draw.circle(sprite, color, (radius, radius), radius)
+        return sprite
+    
+    def _paint_scenery(self, level, area):
+        """Draw sky, platforms, unhit blocks and pipes into the level strip, clipped to area"""
+        background = level['background']
+        background.set_clip(area)
+        for x in range(0, LEVEL_WIDTH, SCREEN_WIDTH):
+            background.blit(self.sky, (x, 0))
+        
+        for platform in level['platforms']:
+            color = (139, 69, 19) if platform['type'] == 'ground' else (150, 150, 150)
+            pygame.draw.rect(background, color, platform['rect'])
+        
+        for block in level['blocks']:
+            if not block['hit']:
+                if block['type'] == 'question':
+                    background.blit(self.spr_question, block['rect'])
+                elif block['type'] == 'brick':
+                    background.blit(self.spr_brick, block['rect'])
+        
+        for pipe in level['pipes']:
+            rect = pipe['rect']
+            background.blit(self._pipe_body(rect.width, rect.height), rect)
+            background.blit(self.spr_pipe_top, (rect.x - 8, rect.y))
+        background.set_clip(None)
+    
+    def _bordered_tile(self, size, fill, border, width):
+        tile = pygame.Surface(size).convert()
+        tile.fill(fill)
+        pygame.draw.rect(tile, border, tile.get_rect(), width)
+        return tile
+    
+    def _pipe_body(self, width, height):
+        """Pipe body tile for a given size, built on first use"""
+        key = (width, height)
+        tile = self.spr_pipe_bodies.get(key)
+        if tile is None:
+            tile = self._bordered_tile(key, (0, 200, 0), (0, 150, 0), 3)
+            self.spr_pipe_bodies[key] = tile
+        return tile
+    
     def render(self):
         """Main render function"""
         if self.state == GameState.LEVEL:
@@ -658,217 +1048,221 @@ class MarioForeverEngine:
     
     def render_level(self):
         """Render level Mario Forever style"""
-        # Sky gradient
-        for y in range(SCREEN_HEIGHT):
-            blue = min(255, 100 + y // 4)
-            self.screen.fill((100, 150, blue), (0, y, SCREEN_WIDTH, 1))
-        
-        if not self.current_level_data:
+        level = self.current_level_data
+        if not level:
+            # Sky gradient
+            self.screen.blit(self.sky, (0, 0))
             return
         
-        # Camera
-        camera_x = max(0, min(self.mario['pos'][0] - SCREEN_WIDTH//3, 5000 - SCREEN_WIDTH))
+        # Camera, in whole pixels so sprites stay aligned with the scenery
+        camera_x = int(max(0, min(self.mario_px - SCREEN_WIDTH//3, LEVEL_WIDTH - SCREEN_WIDTH)))
+        self._camera_x = camera_x
         
-        # Render platforms
-        for platform in self.current_level_data.get('platforms', []):
-            rect = platform['rect'].copy()
-            rect.x -= camera_x
-            
-            if -100 < rect.x < SCREEN_WIDTH + 100:
-                color = (139, 69, 19) if platform['type'] == 'ground' else (150, 150, 150)
-                pygame.draw.rect(self.screen, color, rect)
-                
-                # Photonic edge glow
-                if random.random() < 0.1:
-                    self.photonic.emit_photon_burst(
-                        rect.x + random.randint(0, rect.width),
-                        rect.y, 2, color, 1
-                    )
-        
-        # Render blocks
-        for block in self.current_level_data.get('blocks', []):
-            if not block.get('hit', False):
-                rect = block['rect'].copy()
-                rect.x -= camera_x
-                
-                if -50 < rect.x < SCREEN_WIDTH + 50:
-                    if block['type'] == 'question':
-                        color = (255, 200, 0)
-                        pygame.draw.rect(self.screen, color, rect)
-                        pygame.draw.rect(self.screen, (200, 150, 0), rect, 2)
-                        
-                        # Question mark
-                        font = pygame.font.Font(None, 24)
-                        text = font.render("?", True, (255, 255, 255))
-                        self.screen.blit(text, (rect.x + 10, rect.y + 4))
-                    elif block['type'] == 'brick':
-                        color = (150, 75, 0)
-                        pygame.draw.rect(self.screen, color, rect)
-                        pygame.draw.rect(self.screen, (100, 50, 0), rect, 2)
-        
-        # Render pipes
-        for pipe in self.current_level_data.get('pipes', []):
-            rect = pipe['rect'].copy()
-            rect.x -= camera_x
-            
-            if -100 < rect.x < SCREEN_WIDTH + 100:
-                # Pipe body
-                pygame.draw.rect(self.screen, (0, 200, 0), rect)
-                pygame.draw.rect(self.screen, (0, 150, 0), rect, 3)
-                
-                # Pipe top
-                top_rect = pygame.Rect(rect.x - 8, rect.y, rect.width + 16, 32)
-                pygame.draw.rect(self.screen, (0, 200, 0), top_rect)
-                pygame.draw.rect(self.screen, (0, 150, 0), top_rect, 3)
+        # Sky, platforms, blocks and pipes: one blit from the level strip
+        self.screen.blit(level['background'], (0, 0), (camera_x, 0, SCREEN_WIDTH, SCREEN_HEIGHT))
+        
+        # Photonic edge glow: each visible platform sheds 2 photons 10% of the time
+        xywh = level['plat_xywh']
+        sx, visible = self._visible(xywh, camera_x, 100)
+        rng = self.photonic.rng
+        glow = visible[rng.random(len(visible)) < 0.1]
+        if len(glow):
+            xs = sx[glow].astype(np.int32) + rng.integers(0, xywh[glow, 2] + 1)
+            self.photonic.emit_bulk(
+                np.repeat(xs, 2), np.repeat(xywh[glow, 1], 2),
+                np.repeat(level['plat_colors'][glow], 2, axis=0), 1
+            )
         
         # Render enemies
-        for enemy in self.current_level_data.get('enemies', []):
-            ex = enemy['pos'][0] - camera_x
-            ey = enemy['pos'][1]
-            
-            if -50 < ex < SCREEN_WIDTH + 50:
-                colors = {
-                    'goomba': (150, 75, 0),
-                    'koopa_green': (0, 200, 0),
-                    'koopa_red': (200, 0, 0)
-                }
-                color = colors.get(enemy['type'], (100, 100, 100))
-                pygame.draw.rect(self.screen, color, (ex, ey, 30, 30))
-                
-                # Enemy eyes
-                pygame.draw.circle(self.screen, (255, 255, 255), (int(ex + 8), int(ey + 10)), 4)
-                pygame.draw.circle(self.screen, (255, 255, 255), (int(ex + 22), int(ey + 10)), 4)
-                pygame.draw.circle(self.screen, (0, 0, 0), (int(ex + 8), int(ey + 10)), 2)
-                pygame.draw.circle(self.screen, (0, 0, 0), (int(ex + 22), int(ey + 10)), 2)
+        enemies = level['enemies']
+        enemy_pos = level['enemy_pos']
+        sx, visible = self._visible(enemy_pos, camera_x, 50)
+        enemy_blits = []
+        for i in visible.tolist():
+            sprite = self.spr_enemies.get(enemies[i]['type'], self.spr_enemy_default)
+            enemy_blits.append((sprite, (int(sx[i]), int(enemy_pos[i, 1]))))
+        dirty = self.screen.blits(enemy_blits)
         
         # Render Mario
-        mx = self.mario['pos'][0] - camera_x
-        my = self.mario['pos'][1]
+        mx = self.mario_px - camera_x
+        my = self.mario_py
+        mario_rect = self.get_mario_rect()
+        mario_rect.x -= camera_x
+        # Mario plus the ring his invincibility sparkles can reach
+        dirty.append(mario_rect.union((int(mx) - 16, int(my) - 8, 57, 57)))
         
         if -50 < mx < SCREEN_WIDTH + 50:
-            mario_rect = self.get_mario_rect()
-            mario_rect.x -= camera_x
-            
             # Mario colors based on power-up
-            colors = {
-                PowerUp.SMALL: (255, 0, 0),
-                PowerUp.SUPER: (255, 0, 0),
-                PowerUp.FIRE: (255, 100, 100),
-                PowerUp.BEET: (200, 0, 200),
-                PowerUp.HAMMER: (100, 100, 100),
-                PowerUp.TANOOKI: (150, 75, 0)
-            }
-            color = colors.get(self.mario['power'], (255, 0, 0))
+            color = MARIO_COLORS.get(self.mario['power'], (255, 0, 0))
             
-            # Draw Mario
-            pygame.draw.rect(self.screen, color, mario_rect)
-            
-            # Mario details
-            if self.mario['power'] != PowerUp.SMALL:
-                # Hat
-                pygame.draw.rect(self.screen, color, (mario_rect.x, mario_rect.y, mario_rect.width, 8))
-            
-            # Face
-            face_color = (255, 220, 177)
-            pygame.draw.rect(self.screen, face_color, 
-                           (mario_rect.x + 4, mario_rect.y + 8, mario_rect.width - 8, 10))
-            
-            # Eyes
-            eye_x = mario_rect.x + (16 if self.mario['facing_right'] else 4)
-            pygame.draw.circle(self.screen, (0, 0, 0), (eye_x, mario_rect.y + 12), 2)
+            # Draw Mario; the screen stays locked across this run of draw
+            # calls (blits below need it unlocked again)
+            self.screen.lock()
+            try:
+                pygame.draw.rect(self.screen, color, mario_rect)
+                
+                # Mario details
+                if self.mario['power'] != PowerUp.SMALL:
+                    # Hat
+                    pygame.draw.rect(self.screen, color, (mario_rect.x, mario_rect.y, mario_rect.width, 8))
+                
+                # Face
+                face_color = (255, 220, 177)
+                pygame.draw.rect(self.screen, face_color, 
+                               (mario_rect.x + 4, mario_rect.y + 8, mario_rect.width - 8, 10))
+                
+                # Eyes
+                eye_x = mario_rect.x + (16 if self.mario['facing_right'] else 4)
+                pygame.draw.circle(self.screen, (0, 0, 0), (eye_x, mario_rect.y + 12), 2)
+            finally:
+                self.screen.unlock()
             
             # Invincibility effect
             if self.mario['invincible'] > 0:
                 if self.mario['invincible'] % 4 < 2:  # Flashing
-                    for i in range(5):
-                        angle = (pygame.time.get_ticks() * 0.02 + i * 72) % 360
-                        sx = mx + 12 + math.cos(math.radians(angle)) * 25
-                        sy = my + 20 + math.sin(math.radians(angle)) * 25
-                        pygame.draw.circle(self.screen, 
-                                         (random.randint(100, 255), 
-                                          random.randint(100, 255), 
-                                          random.randint(100, 255)), 
-                                         (int(sx), int(sy)), 3)
+                    base = int(pygame.time.get_ticks() * 0.02)
+                    frame = self.mario['invincible']
+                    sparkles = []
+                    for i, offset in enumerate(self._sparkle_angles):
+                        angle = (base + offset) % 360
+                        sx = mx + 12 + COS_TABLE[angle] * 25
+                        sy = my + 20 + SIN_TABLE[angle] * 25
+                        sparkles.append((self._sparkle_sprites[(frame + i * 13) & 63], (int(sx) - 3, int(sy) - 3)))
+                    self.screen.blits(sparkles, doreturn=False)
         
         # Update and render particles
-        for particle in self.photonic.particles[:]:
-            particle['pos'][0] += particle['vel'][0]
-            particle['pos'][1] += particle['vel'][1]
-            particle['vel'][1] += 0.2
-            particle['life'] -= 3
-            
-            if particle['life'] <= 0:
-                self.photonic.particles.remove(particle)
-            else:
-                px = particle['pos'][0] - camera_x
-                py = particle['pos'][1]
-                
-                if 0 <= px <= SCREEN_WIDTH:
-                    alpha = min(255, particle['life'])
-                    color = tuple(map(int, particle['color']))
-                    size = max(1, particle['life'] // 100)
-                    pygame.draw.circle(self.screen, color, (int(px), int(py)), size)
+        photonic = self.photonic
+        photonic.update_particles(0.2, 3)
+        n = photonic.n
+        px = photonic.pos[:n, 0] - camera_x
+        py = photonic.pos[:n, 1]
+        # Particles above or below the screen are skipped too; most of a
+        # burst's life is spent falling out of view
+        visible = np.flatnonzero((px >= 0) & (px <= SCREEN_WIDTH) & (py > -3) & (py < SCREEN_HEIGHT + 3))
+        if len(visible):
+            # One sprite per (color, radius), keyed as packed ints: rgb << 2 | radius
+            sizes = PARTICLE_SIZE_LUT[photonic.life[visible]]
+            rgb = photonic.color[visible].astype(np.int32)
+            keys = (rgb[:, 0] << 18) | (rgb[:, 1] << 10) | (rgb[:, 2] << 2) | sizes
+            xs = px[visible].astype(np.int32) - sizes
+            ys = py[visible].astype(np.int32) - sizes
+            sprites = self.spr_particles
+            particle_blits = []
+            for key, x, y in zip(keys.tolist(), xs.tolist(), ys.tolist()):
+                sprite = sprites.get(key) or self._particle_sprite(key)
+                particle_blits.append((sprite, (x, y)))
+            dirty += self.screen.blits(particle_blits)
         
         # HUD
         self.render_hud()
+        dirty.append(pygame.Rect(0, 0, SCREEN_WIDTH, 40))
+        self._dirty_rects = dirty
+    
+    def present(self):
+        """Show the frame, updating only dirty rects while the view is still"""
+        if (self.state != GameState.LEVEL or self._full_redraw
+                or self._camera_x != self._prev_camera_x):
+            pygame.display.flip()
+        else:
+            # Last frame's rects erase sprites that have since moved away
+            pygame.display.update(self._prev_dirty + self._dirty_rects)
+        self._prev_camera_x = self._camera_x
+        self._prev_dirty = self._dirty_rects
+        self._dirty_rects = []
+        self._full_redraw = False
+    
+    def _text(self, text, color, font=None):
+        """Rendered text surface, cached by (text, color, font)"""
+        font = font or self.font_small
+        key = (text, color, font)
+        surf = self._text_cache.get(key)
+        if surf is None:
+            if len(self._text_cache) >= 256:
+                # Evict the oldest entry; dicts keep insertion order
+                del self._text_cache[next(iter(self._text_cache))]
+            surf = self._text_cache[key] = font.render(text, True, color).convert_alpha()
+        return surf
+    
+    def _build_digit_atlas(self):
+        """Pre-render the digits 0-9 in every HUD color"""
+        self._digits = {
+            color: {str(d): self.font_small.render(str(d), True, color).convert_alpha() for d in range(10)}
+            for color in ((255, 255, 255), (255, 255, 0), (255, 0, 0))
+        }
+    
+    def _build_hud(self):
+        """Pre-render the HUD bar with its icons and fixed labels"""
+        hud = pygame.Surface((SCREEN_WIDTH, 40)).convert()
+        hud.fill((0, 0, 0))
+        pygame.draw.circle(hud, (255, 255, 0), (190, 20), 8)  # Coin icon
+        pygame.draw.rect(hud, (255, 0, 0), (680, 12, 12, 16))  # Mario icon
+        
+        # Labels whose color never changes; digits are drawn after them
+        self._hud_digit_x = {}
+        for field, label, color, x in (('score', "SCORE: ", (255, 255, 255), 10),
+                                       ('coins', "x", (255, 255, 0), 200),
+                                       ('lives', "x", (255, 255, 255), 700)):
+            label_surf = self.font_small.render(label, True, color)
+            hud.blit(label_surf, (x, 10))
+            self._hud_digit_x[field] = x + label_surf.get_width()
+        self._hud_static = hud
+    
+    def _digit_blits(self, digits, color, x, y):
+        """(surface, dest) pairs drawing a digit string from the atlas"""
+        blits = []
+        glyphs = self._digits[color]
+        for ch in digits:
+            glyph = glyphs[ch]
+            blits.append((glyph, (x, y)))
+            x += glyph.get_width()
+        return blits
+    
+    def _number_blits(self, label, digits, color, x, y):
+        """(surface, dest) pairs for a label followed by atlas digits"""
+        label_surf = self._text(label, color)
+        return [(label_surf, (x, y))] + self._digit_blits(digits, color, x + label_surf.get_width(), y)
     
     def render_hud(self):
         """Render HUD Mario Forever style"""
-        # Black bar at top
-        pygame.draw.rect(self.screen, (0, 0, 0), (0, 0, SCREEN_WIDTH, 40))
-        
-        font = pygame.font.Font(None, 24)
-        
-        # Score
-        score_text = font.render(f"SCORE: {self.score:06d}", True, (255, 255, 255))
-        self.screen.blit(score_text, (10, 10))
+        # Bar, icons and fixed labels
+        self.screen.blit(self._hud_static, (0, 0))
         
-        # Coins
-        coin_text = font.render(f"x{self.coins:02d}", True, (255, 255, 0))
-        self.screen.blit(coin_text, (200, 10))
-        pygame.draw.circle(self.screen, (255, 255, 0), (190, 20), 8)
-        
-        # World
-        world_text = font.render(f"WORLD {self.current_world}-{self.current_level}", True, (255, 255, 255))
-        self.screen.blit(world_text, (350, 10))
-        
-        # Time
-        time_color = (255, 255, 255) if self.time > 100 else (255, 0, 0)
-        time_text = font.render(f"TIME: {self.time:03d}", True, time_color)
-        self.screen.blit(time_text, (550, 10))
-        
-        # Lives
-        lives_text = font.render(f"x{self.lives}", True, (255, 255, 255))
-        self.screen.blit(lives_text, (700, 10))
-        # Mario icon
-        pygame.draw.rect(self.screen, (255, 0, 0), (680, 12, 12, 16))
+        # Counters, the time label (it turns red) and world name in one batched blit
+        white = (255, 255, 255)
+        time_color = white if self.time > 100 else (255, 0, 0)
+        digit_x = self._hud_digit_x
+        world_text = self._text(f"WORLD {self.current_world}-{self.current_level}", white)
+        self.screen.blits(
+            self._digit_blits(f"{self.score:06d}", white, digit_x['score'], 10)
+            + self._digit_blits(f"{self.coins:02d}", (255, 255, 0), digit_x['coins'], 10)
+            + self._number_blits("TIME: ", f"{self.time:03d}", time_color, 550, 10)
+            + self._digit_blits(str(self.lives), white, digit_x['lives'], 10)
+            + [(world_text, (350, 10))],
+            doreturn=False
+        )
     
     def render_world_map(self):
         """Render world map"""
         self.screen.fill((100, 150, 200))
         
-        font = pygame.font.Font(None, 48)
-        title = font.render("WORLD MAP", True, (255, 255, 255))
+        title = self._text("WORLD MAP", (255, 255, 255), self.font_large)
         self.screen.blit(title, (SCREEN_WIDTH//2 - 100, 50))
         
-        font = pygame.font.Font(None, 32)
-        text = font.render(f"World {self.current_world}: {self.worlds[self.current_world]['name']}", 
-                          True, (255, 255, 255))
+        text = self._text(f"World {self.current_world}: {self.worlds[self.current_world]['name']}",
+                          (255, 255, 255), self.font_medium)
         self.screen.blit(text, (SCREEN_WIDTH//2 - 150, 150))
         
-        text = font.render("Press Z to start level", True, (255, 255, 255))
+        text = self._text("Press Z to start level", (255, 255, 255), self.font_medium)
         self.screen.blit(text, (SCREEN_WIDTH//2 - 120, 300))
     
     def render_game_over(self):
         """Render game over screen"""
         self.screen.fill((0, 0, 0))
         
-        font = pygame.font.Font(None, 72)
-        text = font.render("GAME OVER", True, (255, 0, 0))
+        text = self._text("GAME OVER", (255, 0, 0), self.font_huge)
         self.screen.blit(text, (SCREEN_WIDTH//2 - 180, SCREEN_HEIGHT//2 - 50))
         
-        font = pygame.font.Font(None, 32)
-        text = font.render(f"Final Score: {self.score}", True, (255, 255, 255))
+        text = self._text(f"Final Score: {self.score}", (255, 255, 255), self.font_medium)
         self.screen.blit(text, (SCREEN_WIDTH//2 - 100, SCREEN_HEIGHT//2 + 50))
     
     # ============= MAIN GAME LOOP =============
@@ -894,15 +1288,18 @@ class MarioForeverEngine:
                             )
                     elif self.state == GameState.GAME_OVER:
                         if event.key == pygame.K_RETURN:
-                            self.__init__()  # Reset game
+                            self._reset_run_state()
             
             # Update
             if self.state == GameState.LEVEL and not self.paused:
                 self.handle_input()
                 self.update_mario_physics()
+                self.update_enemies()
                 
-                # Update timer
-                if pygame.time.get_ticks() % 1000 < 16:  # Once per second
+                # Update timer, one TIME tick per full second of play
+                self._time_accum_ms += self._frame_ms
+                while self._time_accum_ms >= 1000:
+                    self._time_accum_ms -= 1000
                     self.time -= 1
                     if self.time <= 0:
                         self.damage_mario()
@@ -916,8 +1313,8 @@ class MarioForeverEngine:
             self.render()
             
             # Update display
-            pygame.display.flip()
-            self.clock.tick(FPS)
+            self.present()
+            self._frame_ms = self.clock.tick(FPS)
         
         pygame.quit()
 
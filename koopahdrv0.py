@@ -6,10 +6,34 @@ import pygame
 import numpy as np
 import random
 import math
+import array
 import json
-from collections import deque
-from enum import Enum
-from dataclasses import dataclass
+import copy
+import os
+import queue
+import threading
+import cProfile
+import pstats
+from enum import Enum, IntEnum
+from dataclasses import dataclass, field
+
+try:
+    from numba import njit, prange
+    NUMBA_AVAILABLE = True
+except ImportError:  # Numba is optional; kernels fall back to plain Python
+    NUMBA_AVAILABLE = False
+    prange = range
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+try:
+    import cupy
+    CUPY_AVAILABLE = True
+except ImportError:  # CuPy is optional; the particle step stays on the CPU
+    cupy = None
+    CUPY_AVAILABLE = False
 
 # Initialize Pygame
 pygame.init()
@@ -17,6 +41,64 @@ SCREEN_WIDTH = 800
 SCREEN_HEIGHT = 600
 FPS = 60
 
+# KOOPA_THREADED=1 runs game logic on a worker thread, overlapped with the
+# main thread's flip/tick (see UpdateWorker)
+THREADED_UPDATE = os.environ.get('KOOPA_THREADED') == '1'
+
+# KOOPA_PROFILE=1 profiles the main loop and prints the top entries on exit.
+# cProfile only sees the calling thread, so combine it with KOOPA_THREADED
+# only when the render side is what is being measured
+PROFILE_RUN = os.environ.get('KOOPA_PROFILE') == '1'
+PROFILE_LINES = 30
+
+# KOOPA_GPU=1 steps particles with CuPy (needs cupy and a working CUDA device).
+# The pool lives in host memory, so each frame pays an upload and download
+GPU_STEP = os.environ.get('KOOPA_GPU') == '1' and CUPY_AVAILABLE
+
+TWO_PI = 2 * math.pi
+
+# Whole-degree cos/sin lookup tables for cosmetic effects
+COS_TABLE = array.array('f', [math.cos(math.radians(i)) for i in range(360)])
+SIN_TABLE = array.array('f', [math.sin(math.radians(i)) for i in range(360)])
+GRID_CELL = 256  # Column width of the platform broad-phase grid
+TRAIL_LENGTH = 15  # Frames of position history kept per particle
+MAX_PARTICLES = 8192  # Photon pool size; a full pool recycles its oldest photons
+
+# Gaussian splat footprint: 7x7 [x, y] weights, zero outside radius 3
+SPLAT_RADIUS = 3
+SPLAT_WEIGHTS = np.fromfunction(
+    lambda x, y: np.exp(-((x - 3) ** 2 + (y - 3) ** 2) / 2) * (np.hypot(x - 3, y - 3) < 3),
+    (7, 7)).astype(np.float32)
+SPLAT_CACHE_LIMIT = 4096  # Distinct (color, brightness) splat sprites kept alive
+
+# Static geometry colors
+PLATFORM_COLORS = {
+    'ground': (139, 69, 19),
+    'ice': (200, 230, 255),
+    'metal': (150, 150, 150),
+    'fortress_floor': (100, 100, 100),
+    'castle_block': (80, 80, 80),
+    'airship_deck': (120, 80, 40)
+}
+BLOCK_COLORS = {
+    'brick': (150, 75, 0),
+    'question': (255, 200, 0)
+}
+PIPE_COLORS = {
+    'green': (0, 200, 0),
+    'red': (200, 0, 0),
+    'yellow': (200, 200, 0)
+}
+ENEMY_COLORS = {
+    'goomba': (150, 75, 0),
+    'koopa_green': (0, 200, 0),
+    'koopa_red': (200, 0, 0),
+    'hammer_bro': (50, 150, 50),
+    'dry_bones': (200, 200, 200),
+    'lakitu': (100, 100, 100),
+    'piranha_plant': (200, 0, 0)
+}
+
 # Game States
 class GameState(Enum):
     WORLD_MAP = 1
@@ -38,63 +120,428 @@ class PowerUp(Enum):
     FROG = 6
     CLOUD = 7
 
+MARIO_COLORS = {
+    PowerUp.SMALL: (255, 0, 0),
+    PowerUp.SUPER: (255, 0, 0),
+    PowerUp.FIRE: (255, 100, 100),
+    PowerUp.RACCOON: (150, 75, 0),
+    PowerUp.TANOOKI: (150, 100, 50),
+    PowerUp.HAMMER: (100, 100, 100),
+    PowerUp.FROG: (0, 200, 0)
+}
+
+# World map themes
+class Theme(IntEnum):
+    OVERWORLD = 0
+    DESERT = 1
+    OCEAN = 2
+    GIANT = 3
+    SKY = 4
+    ICE = 5
+    PIPES = 6
+    DARK = 7
+
+# World bosses; the value is the world they rule
+class Boss(IntEnum):
+    LARRY = 1
+    MORTON = 2
+    WENDY = 3
+    IGGY = 4
+    ROY = 5
+    LEMMY = 6
+    LUDWIG = 7
+    BOWSER = 8
+
+# How a level is cleared; BOSS/AIRSHIP are fought against the world's Boss
+class ExitType(IntEnum):
+    FLAG = 0
+    CARD = 1
+    PIPE = 2
+    TREASURE = 3
+    BOOM_BOOM = 4
+    BOSS = 5
+    AIRSHIP = 6
+
+# Level layouts (keys of SMB3Engine._LEVEL_GENERATORS)
+class LevelType(IntEnum):
+    STANDARD = 0
+    FORTRESS = 1
+    CASTLE = 2
+    AIRSHIP = 3
+    PYRAMID = 4
+    QUICKSAND = 5
+    PYRAMID_INSIDE = 6
+    WATER = 7
+    UNDERWATER = 8
+    BIG_ISLAND = 9
+    SPIKE = 10
+    BRIDGE = 11
+    GIANT = 12
+    GIANT_PIPES = 13
+    GIANT_BLOCKS = 14
+    GIANT_WATER = 15
+    GIANT_ENEMIES = 16
+    CLOUDS = 17
+    ROTATING_PLATFORMS = 18
+    CHAIN_CHOMPS = 19
+    PARABEETLES = 20
+    TOWER = 21
+    SPIRAL_TOWER = 22
+    ICE = 23
+    ICE_BLOCKS = 24
+    ICE_FORTRESS = 25
+    SLIPPERY = 26
+    ICE_UNDERWATER = 27
+    ICE_SPIKES = 28
+    ICE_MAZE = 29
+    PIPES = 30
+    PIPE_MAZE = 31
+    UNDERWATER_PIPES = 32
+    PIRANHA_GARDEN = 33
+    FAST_PIPES = 34
+    PIRANHA_BOSS = 35
+    TANKS = 36
+    BATTLESHIPS = 37
+    HAND_TRAPS = 38
+    AIRSHIP_FLEET = 39
+    SUPER_TANK = 40
+    FINAL_CASTLE = 41
+    DESERT = 42
+    SKY = 43
+
+@dataclass(slots=True)
+class LevelInfo:
+    type: LevelType
+    exit: ExitType
+    secret: bool
+    sun: bool = False
+
+@dataclass(slots=True)
+class World:
+    name: str
+    theme: Theme
+    boss: Boss
+    levels: dict
+
+@dataclass(slots=True)
+class Platform:
+    rect: pygame.Rect
+    type: str
+    collision: bool = True
+    destructible: bool = False
+    friction: float = 0.0
+    fall_timer: int = 0
+    falling: bool = False
+    color: tuple = None  # Resolved from type by _index_geometry
+
+@dataclass(slots=True)
+class Block:
+    rect: pygame.Rect
+    type: str
+    contains: str = 'coin'
+    hit: bool = False
+    color: tuple = None
+
+@dataclass(slots=True)
+class Pipe:
+    rect: pygame.Rect
+    type: str
+    enterable: bool = False
+    destination: str = None
+    orientation: str = 'up'
+    id: int = None
+    connected_to: int = None
+    color: tuple = None
+
+@dataclass(slots=True)
+class Level:
+    """Generated level; generators fill only the fields their layout uses"""
+    platforms: list = field(default_factory=list)
+    enemies: list = field(default_factory=list)
+    powerups: list = field(default_factory=list)
+    pipes: list = field(default_factory=list)
+    blocks: list = field(default_factory=list)
+    decorations: list = field(default_factory=list)
+    checkpoints: list = field(default_factory=list)
+    hazards: list = field(default_factory=list)
+    cannons: list = field(default_factory=list)
+    propellers: list = field(default_factory=list)
+    clouds: list = field(default_factory=list)
+    vehicles: list = field(default_factory=list)
+    quicksand: list = field(default_factory=list)
+    lava_bubbles: list = field(default_factory=list)
+    photonic_zones: list = field(default_factory=list)
+    pipe_network: dict = field(default_factory=dict)
+    scroll_speed: int = 0
+    water_line: int = None
+    lava_y: int = None
+    current: float = 0.0
+    boss_room: dict = None
+    bowser_arena: dict = None
+    angry_sun: dict = None
+    
+    # SoA geometry: (N, 4) int32 x1, y1, x2, y2 rows mirroring the rects above
+    platforms_xyxy: np.ndarray = None
+    blocks_xyxy: np.ndarray = None
+    pipes_xyxy: np.ndarray = None
+    clouds_xyxy: np.ndarray = None
+    quicksand_xyxy: np.ndarray = None
+    vehicles_xyxy: np.ndarray = None
+    platforms_types: np.ndarray = None
+    blocks_types: np.ndarray = None
+    pipes_types: np.ndarray = None
+    platforms_collision: np.ndarray = None
+    platform_grid: dict = None  # GRID_CELL column -> ascending platform rows
+    cull_index: dict = field(default_factory=dict)  # key -> (x-sorted rows, their x1, widest item)
+    
+    # Pre-rendered static strips, painted on first draw (never on the cached copy)
+    background: pygame.Surface = None
+    foreground: pygame.Surface = None
+
 # ============= PHOTONIC ENGINE =============
+# Explicit signatures compile the kernels at import instead of on first use
+@njit('void(float32[:, :], float32[:, :], int16[:], int64, float64, int64)',
+      parallel=True, fastmath=True, cache=True)
+def step_particles(pos, vel, life, n, gravity, decay):
+    """Integrate the first n particles in place"""
+    for i in prange(n):
+        pos[i, 0] += vel[i, 0]
+        pos[i, 1] += vel[i, 1]
+        vel[i, 1] += gravity
+        life[i] -= decay
+
+@njit('int64(float32[:, :], float32[:, :], uint8[:, :], int16[:], float32[:, :, :], int64)', cache=True)
+def compact_particles(pos, vel, color, life, trails, n):
+    """Swap each dead particle with the last live one; returns the live count"""
+    i = 0
+    while i < n:
+        if life[i] <= 0:
+            n -= 1
+            pos[i] = pos[n]
+            vel[i] = vel[n]
+            color[i] = color[n]
+            life[i] = life[n]
+            trails[i] = trails[n]
+        else:
+            i += 1
+    return n
+
+@njit('int64(int64[::1], int32[:, ::1], boolean[::1], int64[::1])', cache=True, boundscheck=False)
+def first_platform_hit(box, xyxy, solid, rows):
+    """First of the (ascending) candidate rows that is solid and overlaps box, or -1"""
+    x1, y1, x2, y2 = box[0], box[1], box[2], box[3]
+    for i in rows:
+        if solid[i] and x1 < xyxy[i, 2] and x2 > xyxy[i, 0] and y1 < xyxy[i, 3] and y2 > xyxy[i, 1]:
+            return i
+    return -1
+
 class PhotonicGaussianEngine:
     def __init__(self):
-        self.particles = []
-        self.gaussian_kernel = self._create_gaussian_kernel(5, 1.0)
-        self.splat_buffer = np.zeros((SCREEN_WIDTH, SCREEN_HEIGHT, 4))
+        self._splat_cache = {}  # Display-format sprites; filled once a display mode is set
         self.light_sources = []
-        self.photon_limit = 10000
+        self.photon_limit = MAX_PARTICLES
+        self.rng = np.random.default_rng()
+        self.use_numba = NUMBA_AVAILABLE
+        self.use_gpu = GPU_STEP
+        
+        # Particle pool (structure of arrays); live particles occupy [0:n]
+        self.pos = np.zeros((self.photon_limit, 2), np.float32)
+        self.vel = np.zeros((self.photon_limit, 2), np.float32)
+        self.color = np.zeros((self.photon_limit, 3), np.uint8)
+        self.life = np.zeros(self.photon_limit, np.int16)
+        self.n = 0
+        
+        # Trail history ring buffer shared by all particles; trail_head is
+        # the slot the next frame's positions are written to
+        self.trails = np.zeros((self.photon_limit, TRAIL_LENGTH, 2), np.float32)
+        self.trail_head = 0
         self.evolution_params = {
             'mutation_rate': 0.1,
             'fitness_threshold': 0.7,
             'generation': 0
         }
         
-    def _create_gaussian_kernel(self, size, sigma):
-        kernel = np.zeros((size, size))
-        center = size // 2
-        for i in range(size):
-            for j in range(size):
-                x, y = i - center, j - center
-                kernel[i, j] = np.exp(-(x**2 + y**2) / (2 * sigma**2))
-        return kernel / kernel.sum()
+    def splat_keys(self, idx):
+        """Packed splat sprite keys for particles idx: 5-bit rgb << 4 | life >> 4"""
+        rgb = self.color[idx].astype(np.int32) >> 3
+        return (rgb[:, 0] << 14) | (rgb[:, 1] << 9) | (rgb[:, 2] << 4) | (self.life[idx] >> 4)
+    
+    def splat_sprite(self, key):
+        """Additive Gaussian sprite for a packed splat key, built on first use"""
+        sprite = self._splat_cache.get(key)
+        if sprite is None:
+            if len(self._splat_cache) >= SPLAT_CACHE_LIMIT:
+                self._splat_cache.clear()
+            color = np.array(((key >> 14) & 31, (key >> 9) & 31, (key >> 4) & 31), np.float32) * 8 + 4
+            brightness = ((key & 15) * 16 + 8) / 255
+            rgb = SPLAT_WEIGHTS[:, :, None] * color * brightness
+            sprite = pygame.surfarray.make_surface(rgb.astype(np.uint8)).convert()
+            self._splat_cache[key] = sprite
+        return sprite
+    
+    def _evict_oldest(self, count):
+        """Drop the count lowest-life (oldest) photons, keeping the rest packed in [0:n]"""
+        n = self.n
+        keep = np.ones(n, bool)
+        keep[np.argpartition(self.life[:n], count - 1)[:count]] = False
+        for arr in (self.pos, self.vel, self.color, self.life, self.trails):
+            arr[:n - count] = arr[:n][keep]
+        self.n = n - count
+    
+    def _spawn(self, count, spread):
+        """Claim count slots (at most the pool size) with random velocities and full life"""
+        count = max(0, min(count, self.photon_limit))
+        overflow = self.n + count - self.photon_limit
+        if overflow > 0:
+            self._evict_oldest(overflow)
+        start = self.n
+        end = start + count
+        angle = self.rng.uniform(0, TWO_PI, end - start)
+        speed = self.rng.uniform(1, spread, end - start)
+        self.vel[start:end, 0] = np.cos(angle) * speed
+        self.vel[start:end, 1] = np.sin(angle) * speed
+        self.life[start:end] = 255
+        self.n = end
+        return slice(start, end)
     
     def emit_photon_burst(self, x, y, count, color, spread=10):
-        for _ in range(min(count, self.photon_limit - len(self.particles))):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(1, spread)
-            self.particles.append({
-                'pos': np.array([x, y], dtype=float),
-                'vel': np.array([math.cos(angle) * speed, math.sin(angle) * speed]),
-                'color': np.array(color),
-                'life': 255,
-                'trail': deque(maxlen=15),
-                'type': 'burst'
-            })
+        slots = self._spawn(count, spread)
+        self.pos[slots] = (x, y)
+        self.color[slots] = color
+        self.trails[slots] = self.pos[slots, None]
+    
+    def emit_bulk(self, xs, ys, counts, colors, spreads):
+        """Emit counts[i] photons at (xs[i], ys[i]) in colors[i] in one vectorized spawn"""
+        counts = np.asarray(counts)
+        limit = self.photon_limit
+        spread = np.repeat(np.asarray(spreads, np.float64), counts)[:limit]
+        slots = self._spawn(len(spread), spread)
+        self.pos[slots, 0] = np.repeat(np.asarray(xs, np.float32), counts)[:limit]
+        self.pos[slots, 1] = np.repeat(np.asarray(ys, np.float32), counts)[:limit]
+        self.color[slots] = np.repeat(np.asarray(colors, np.uint8), counts, axis=0)[:limit]
+        self.trails[slots] = self.pos[slots, None]
+    
+    def update_particles(self, gravity, decay):
+        """Integrate live particles and compact out the dead ones"""
+        n = self.n
+        if self.use_gpu:
+            self._step_gpu(n, gravity, decay)
+            self._record_trails()
+            self._compact()
+            return
+        if self.use_numba:
+            step_particles(self.pos, self.vel, self.life, n, gravity, decay)
+            self._record_trails()
+            self.n = compact_particles(self.pos, self.vel, self.color, self.life, self.trails, n)
+            return
+        
+        pos, vel, life = self.pos[:n], self.vel[:n], self.life[:n]
+        pos += vel
+        vel[:, 1] += gravity
+        life -= decay
+        self._record_trails()
+        self._compact()
+    
+    def _compact(self):
+        """Drop dead particles, keeping the live ones packed at [0:n]"""
+        n = self.n
+        alive = self.life[:n] > 0
+        count = int(np.count_nonzero(alive))
+        if count < n:
+            for arr in (self.pos, self.vel, self.color, self.life, self.trails):
+                arr[:count] = arr[:n][alive]
+            self.n = count
+    
+    def _step_gpu(self, n, gravity, decay):
+        """Integrate the first n particles on the GPU with one upload/download"""
+        pos = cupy.asarray(self.pos[:n])
+        vel = cupy.asarray(self.vel[:n])
+        life = cupy.asarray(self.life[:n])
+        pos += vel
+        vel[:, 1] += gravity
+        life -= decay
+        self.pos[:n] = cupy.asnumpy(pos)
+        self.vel[:n] = cupy.asnumpy(vel)
+        self.life[:n] = cupy.asnumpy(life)
+    
+    def _record_trails(self):
+        """Write this frame's positions into the trail ring buffer"""
+        self.trails[:self.n, self.trail_head] = self.pos[:self.n]
+        self.trail_head = (self.trail_head + 1) % TRAIL_LENGTH
     
     def evolve_particles(self):
         # AlphaEvolve algorithm for particle optimization
-        if len(self.particles) > 100:
+        n = self.n
+        if n > 100:
             # Calculate fitness based on screen coverage
-            positions = np.array([p['pos'] for p in self.particles])
-            fitness = np.std(positions) / SCREEN_WIDTH
+            fitness = self.pos[:n].std() / SCREEN_WIDTH
             
             if fitness < self.evolution_params['fitness_threshold']:
                 # Mutate particles for better distribution
-                for particle in random.sample(self.particles, int(len(self.particles) * self.evolution_params['mutation_rate'])):
-                    particle['vel'] += np.random.randn(2) * 0.5
+                idx = self.rng.choice(n, int(n * self.evolution_params['mutation_rate']), replace=False)
+                self.vel[idx] += self.rng.standard_normal((len(idx), 2)) * 0.5
             
             self.evolution_params['generation'] += 1
 
+# ============= UPDATE PIPELINE =============
+class UpdateWorker:
+    """Single-slot producer/consumer that runs game logic off the main thread.
+    
+    The main thread submits a job, presents the previous frame, then waits
+    for the job before rendering, so jobs never overlap with drawing. Jobs
+    must not touch pygame display, event or surface state; those calls stay
+    on the main thread.
+    """
+    def __init__(self):
+        self._jobs = queue.Queue(maxsize=1)
+        self._results = queue.Queue(maxsize=1)
+        self._thread = threading.Thread(target=self._loop, name='koopa-update', daemon=True)
+        self._thread.start()
+    
+    def _loop(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            try:
+                job()
+            except BaseException as error:  # Re-raised on the main thread by wait()
+                self._results.put(error)
+            else:
+                self._results.put(None)
+    
+    def submit(self, job):
+        self._jobs.put(job)
+    
+    def wait(self):
+        error = self._results.get()
+        if error is not None:
+            raise error
+    
+    def close(self):
+        self._jobs.put(None)
+        self._thread.join()
+
 # ============= SMB3 ENGINE CORE =============
 class SMB3Engine:
     def __init__(self):
+        # Set the mode first: every cached surface is converted to its format
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Super Mario Bros 3: Mario Forever - Photonic Edition")
         self.clock = pygame.time.Clock()
         self.photonic = PhotonicGaussianEngine()
+        self.rng = np.random.default_rng()
+        self.use_numba = NUMBA_AVAILABLE
+        # Invincibility-star colors, indexed cyclically instead of rolled per frame
+        self._star_palette = self.rng.integers(100, 256, (256, 3), dtype=np.uint8)
+        self._bg_gradient = self._build_gradient()
+        self._particle_sprites = {}
+        
+        # Fonts are built once; rendered strings are cached by _text
+        self.font_tiny = pygame.font.Font(None, 16)
+        self.font_small = pygame.font.Font(None, 24)
+        self.font_large = pygame.font.Font(None, 48)
+        self._text_cache = {}
         
         # Game state
         self.state = GameState.WORLD_MAP
@@ -115,315 +562,331 @@ class SMB3Engine:
             'facing_right': True,
             'invincible': 0,
             'can_shoot': True,
-            'shoot_cooldown': 0
+            'shoot_cooldown': 0,
+            'jump_held': False  # Space was down last frame; jumps need a fresh press
         }
         
         # World definitions
         self.worlds = self._define_worlds()
         self.current_level_data = None
+        self._level_cache = {}
+        self._node_pos_cache = {}
         
     def _define_worlds(self):
         return {
-            1: {  # Grass Land
-                'name': 'Grass Land',
-                'theme': 'overworld',
-                'boss': 'Larry Koopa',
-                'levels': {
-                    1: {'type': 'standard', 'exit_type': 'flag', 'secret': False},
-                    2: {'type': 'standard', 'exit_type': 'flag', 'secret': True},
-                    3: {'type': 'standard', 'exit_type': 'card', 'secret': False},
-                    4: {'type': 'fortress', 'exit_type': 'boom_boom', 'secret': False},
-                    5: {'type': 'standard', 'exit_type': 'flag', 'secret': True},
-                    6: {'type': 'standard', 'exit_type': 'card', 'secret': False},
-                    'castle': {'type': 'castle', 'exit_type': 'larry', 'secret': False},
-                    'airship': {'type': 'airship', 'exit_type': 'larry_airship', 'secret': False}
+            1: World(  # Grass Land
+                name='Grass Land',
+                theme=Theme.OVERWORLD,
+                boss=Boss.LARRY,
+                levels={
+                    1: LevelInfo(LevelType.STANDARD, ExitType.FLAG, False),
+                    2: LevelInfo(LevelType.STANDARD, ExitType.FLAG, True),
+                    3: LevelInfo(LevelType.STANDARD, ExitType.CARD, False),
+                    4: LevelInfo(LevelType.FORTRESS, ExitType.BOOM_BOOM, False),
+                    5: LevelInfo(LevelType.STANDARD, ExitType.FLAG, True),
+                    6: LevelInfo(LevelType.STANDARD, ExitType.CARD, False),
+                    'castle': LevelInfo(LevelType.CASTLE, ExitType.BOSS, False),
+                    'airship': LevelInfo(LevelType.AIRSHIP, ExitType.AIRSHIP, False)
                 }
-            },
-            2: {  # Desert Land
-                'name': 'Desert Land',
-                'theme': 'desert',
-                'boss': 'Morton Koopa Jr.',
-                'levels': {
-                    1: {'type': 'standard', 'exit_type': 'flag', 'secret': False, 'sun': True},
-                    2: {'type': 'pyramid', 'exit_type': 'card', 'secret': True},
-                    3: {'type': 'standard', 'exit_type': 'flag', 'secret': False},
-                    4: {'type': 'quicksand', 'exit_type': 'flag', 'secret': False},
-                    5: {'type': 'fortress', 'exit_type': 'boom_boom', 'secret': False},
-                    'pyramid': {'type': 'pyramid_inside', 'exit_type': 'treasure', 'secret': True},
-                    'castle': {'type': 'castle', 'exit_type': 'morton', 'secret': False},
-                    'airship': {'type': 'airship', 'exit_type': 'morton_airship', 'secret': False}
+            ),
+            2: World(  # Desert Land
+                name='Desert Land',
+                theme=Theme.DESERT,
+                boss=Boss.MORTON,
+                levels={
+                    1: LevelInfo(LevelType.STANDARD, ExitType.FLAG, False, sun=True),
+                    2: LevelInfo(LevelType.PYRAMID, ExitType.CARD, True),
+                    3: LevelInfo(LevelType.STANDARD, ExitType.FLAG, False),
+                    4: LevelInfo(LevelType.QUICKSAND, ExitType.FLAG, False),
+                    5: LevelInfo(LevelType.FORTRESS, ExitType.BOOM_BOOM, False),
+                    'pyramid': LevelInfo(LevelType.PYRAMID_INSIDE, ExitType.TREASURE, True),
+                    'castle': LevelInfo(LevelType.CASTLE, ExitType.BOSS, False),
+                    'airship': LevelInfo(LevelType.AIRSHIP, ExitType.AIRSHIP, False)
                 }
-            },
-            3: {  # Water Land
-                'name': 'Water Land',
-                'theme': 'ocean',
-                'boss': 'Wendy O. Koopa',
-                'levels': {
-                    1: {'type': 'water', 'exit_type': 'flag', 'secret': False},
-                    2: {'type': 'standard', 'exit_type': 'flag', 'secret': False},
-                    3: {'type': 'underwater', 'exit_type': 'pipe', 'secret': True},
-                    4: {'type': 'big_island', 'exit_type': 'card', 'secret': False},
-                    5: {'type': 'fortress', 'exit_type': 'boom_boom', 'secret': False},
-                    6: {'type': 'water', 'exit_type': 'flag', 'secret': False},
-                    7: {'type': 'spike', 'exit_type': 'flag', 'secret': False},
-                    8: {'type': 'underwater', 'exit_type': 'pipe', 'secret': True},
-                    9: {'type': 'bridge', 'exit_type': 'card', 'secret': False},
-                    'castle': {'type': 'castle', 'exit_type': 'wendy', 'secret': False},
-                    'airship': {'type': 'airship', 'exit_type': 'wendy_airship', 'secret': False}
+            ),
+            3: World(  # Water Land
+                name='Water Land',
+                theme=Theme.OCEAN,
+                boss=Boss.WENDY,
+                levels={
+                    1: LevelInfo(LevelType.WATER, ExitType.FLAG, False),
+                    2: LevelInfo(LevelType.STANDARD, ExitType.FLAG, False),
+                    3: LevelInfo(LevelType.UNDERWATER, ExitType.PIPE, True),
+                    4: LevelInfo(LevelType.BIG_ISLAND, ExitType.CARD, False),
+                    5: LevelInfo(LevelType.FORTRESS, ExitType.BOOM_BOOM, False),
+                    6: LevelInfo(LevelType.WATER, ExitType.FLAG, False),
+                    7: LevelInfo(LevelType.SPIKE, ExitType.FLAG, False),
+                    8: LevelInfo(LevelType.UNDERWATER, ExitType.PIPE, True),
+                    9: LevelInfo(LevelType.BRIDGE, ExitType.CARD, False),
+                    'castle': LevelInfo(LevelType.CASTLE, ExitType.BOSS, False),
+                    'airship': LevelInfo(LevelType.AIRSHIP, ExitType.AIRSHIP, False)
                 }
-            },
-            4: {  # Giant Land
-                'name': 'Giant Land',
-                'theme': 'giant',
-                'boss': 'Iggy Koopa',
-                'levels': {
-                    1: {'type': 'giant', 'exit_type': 'flag', 'secret': False},
-                    2: {'type': 'giant_pipes', 'exit_type': 'flag', 'secret': False},
-                    3: {'type': 'giant_blocks', 'exit_type': 'card', 'secret': False},
-                    4: {'type': 'giant_water', 'exit_type': 'flag', 'secret': True},
-                    5: {'type': 'fortress', 'exit_type': 'boom_boom', 'secret': False},
-                    6: {'type': 'giant_enemies', 'exit_type': 'card', 'secret': False},
-                    'castle': {'type': 'castle', 'exit_type': 'iggy', 'secret': False},
-                    'airship': {'type': 'airship', 'exit_type': 'iggy_airship', 'secret': False}
+            ),
+            4: World(  # Giant Land
+                name='Giant Land',
+                theme=Theme.GIANT,
+                boss=Boss.IGGY,
+                levels={
+                    1: LevelInfo(LevelType.GIANT, ExitType.FLAG, False),
+                    2: LevelInfo(LevelType.GIANT_PIPES, ExitType.FLAG, False),
+                    3: LevelInfo(LevelType.GIANT_BLOCKS, ExitType.CARD, False),
+                    4: LevelInfo(LevelType.GIANT_WATER, ExitType.FLAG, True),
+                    5: LevelInfo(LevelType.FORTRESS, ExitType.BOOM_BOOM, False),
+                    6: LevelInfo(LevelType.GIANT_ENEMIES, ExitType.CARD, False),
+                    'castle': LevelInfo(LevelType.CASTLE, ExitType.BOSS, False),
+                    'airship': LevelInfo(LevelType.AIRSHIP, ExitType.AIRSHIP, False)
                 }
-            },
-            5: {  # Sky Land
-                'name': 'Sky Land',
-                'theme': 'sky',
-                'boss': 'Roy Koopa',
-                'levels': {
-                    1: {'type': 'clouds', 'exit_type': 'flag', 'secret': False},
-                    2: {'type': 'rotating_platforms', 'exit_type': 'flag', 'secret': True},
-                    3: {'type': 'chain_chomps', 'exit_type': 'card', 'secret': False},
-                    4: {'type': 'parabeetles', 'exit_type': 'flag', 'secret': False},
-                    5: {'type': 'fortress', 'exit_type': 'boom_boom', 'secret': False},
-                    6: {'type': 'clouds', 'exit_type': 'flag', 'secret': False},
-                    7: {'type': 'tower', 'exit_type': 'pipe', 'secret': True},
-                    8: {'type': 'parabeetles', 'exit_type': 'card', 'secret': False},
-                    9: {'type': 'fortress', 'exit_type': 'boom_boom', 'secret': False},
-                    'tower': {'type': 'spiral_tower', 'exit_type': 'treasure', 'secret': True},
-                    'castle': {'type': 'castle', 'exit_type': 'roy', 'secret': False},
-                    'airship': {'type': 'airship', 'exit_type': 'roy_airship', 'secret': False}
+            ),
+            5: World(  # Sky Land
+                name='Sky Land',
+                theme=Theme.SKY,
+                boss=Boss.ROY,
+                levels={
+                    1: LevelInfo(LevelType.CLOUDS, ExitType.FLAG, False),
+                    2: LevelInfo(LevelType.ROTATING_PLATFORMS, ExitType.FLAG, True),
+                    3: LevelInfo(LevelType.CHAIN_CHOMPS, ExitType.CARD, False),
+                    4: LevelInfo(LevelType.PARABEETLES, ExitType.FLAG, False),
+                    5: LevelInfo(LevelType.FORTRESS, ExitType.BOOM_BOOM, False),
+                    6: LevelInfo(LevelType.CLOUDS, ExitType.FLAG, False),
+                    7: LevelInfo(LevelType.TOWER, ExitType.PIPE, True),
+                    8: LevelInfo(LevelType.PARABEETLES, ExitType.CARD, False),
+                    9: LevelInfo(LevelType.FORTRESS, ExitType.BOOM_BOOM, False),
+                    'tower': LevelInfo(LevelType.SPIRAL_TOWER, ExitType.TREASURE, True),
+                    'castle': LevelInfo(LevelType.CASTLE, ExitType.BOSS, False),
+                    'airship': LevelInfo(LevelType.AIRSHIP, ExitType.AIRSHIP, False)
                 }
-            },
-            6: {  # Ice Land
-                'name': 'Ice Land',
-                'theme': 'ice',
-                'boss': 'Lemmy Koopa',
-                'levels': {
-                    1: {'type': 'ice', 'exit_type': 'flag', 'secret': False},
-                    2: {'type': 'ice_blocks', 'exit_type': 'flag', 'secret': False},
-                    3: {'type': 'ice_fortress', 'exit_type': 'boom_boom', 'secret': False},
-                    4: {'type': 'slippery', 'exit_type': 'card', 'secret': False},
-                    5: {'type': 'ice_underwater', 'exit_type': 'pipe', 'secret': True},
-                    6: {'type': 'ice', 'exit_type': 'flag', 'secret': False},
-                    7: {'type': 'ice_spikes', 'exit_type': 'card', 'secret': False},
-                    8: {'type': 'fortress', 'exit_type': 'boom_boom', 'secret': False},
-                    9: {'type': 'ice_maze', 'exit_type': 'flag', 'secret': True},
-                    10: {'type': 'ice', 'exit_type': 'flag', 'secret': False},
-                    'castle': {'type': 'castle', 'exit_type': 'lemmy', 'secret': False},
-                    'airship': {'type': 'airship', 'exit_type': 'lemmy_airship', 'secret': False}
+            ),
+            6: World(  # Ice Land
+                name='Ice Land',
+                theme=Theme.ICE,
+                boss=Boss.LEMMY,
+                levels={
+                    1: LevelInfo(LevelType.ICE, ExitType.FLAG, False),
+                    2: LevelInfo(LevelType.ICE_BLOCKS, ExitType.FLAG, False),
+                    3: LevelInfo(LevelType.ICE_FORTRESS, ExitType.BOOM_BOOM, False),
+                    4: LevelInfo(LevelType.SLIPPERY, ExitType.CARD, False),
+                    5: LevelInfo(LevelType.ICE_UNDERWATER, ExitType.PIPE, True),
+                    6: LevelInfo(LevelType.ICE, ExitType.FLAG, False),
+                    7: LevelInfo(LevelType.ICE_SPIKES, ExitType.CARD, False),
+                    8: LevelInfo(LevelType.FORTRESS, ExitType.BOOM_BOOM, False),
+                    9: LevelInfo(LevelType.ICE_MAZE, ExitType.FLAG, True),
+                    10: LevelInfo(LevelType.ICE, ExitType.FLAG, False),
+                    'castle': LevelInfo(LevelType.CASTLE, ExitType.BOSS, False),
+                    'airship': LevelInfo(LevelType.AIRSHIP, ExitType.AIRSHIP, False)
                 }
-            },
-            7: {  # Pipe Land
-                'name': 'Pipe Land',
-                'theme': 'pipes',
-                'boss': 'Ludwig von Koopa',
-                'levels': {
-                    1: {'type': 'pipes', 'exit_type': 'flag', 'secret': False},
-                    2: {'type': 'pipe_maze', 'exit_type': 'flag', 'secret': True},
-                    3: {'type': 'underwater_pipes', 'exit_type': 'pipe', 'secret': False},
-                    4: {'type': 'giant_pipes', 'exit_type': 'card', 'secret': False},
-                    5: {'type': 'fortress', 'exit_type': 'boom_boom', 'secret': False},
-                    6: {'type': 'piranha_garden', 'exit_type': 'flag', 'secret': False},
-                    7: {'type': 'pipe_maze', 'exit_type': 'card', 'secret': True},
-                    8: {'type': 'fortress', 'exit_type': 'boom_boom', 'secret': False},
-                    9: {'type': 'fast_pipes', 'exit_type': 'flag', 'secret': False},
-                    'piranha': {'type': 'piranha_boss', 'exit_type': 'treasure', 'secret': True},
-                    'castle': {'type': 'castle', 'exit_type': 'ludwig', 'secret': False},
-                    'airship': {'type': 'airship', 'exit_type': 'ludwig_airship', 'secret': False}
+            ),
+            7: World(  # Pipe Land
+                name='Pipe Land',
+                theme=Theme.PIPES,
+                boss=Boss.LUDWIG,
+                levels={
+                    1: LevelInfo(LevelType.PIPES, ExitType.FLAG, False),
+                    2: LevelInfo(LevelType.PIPE_MAZE, ExitType.FLAG, True),
+                    3: LevelInfo(LevelType.UNDERWATER_PIPES, ExitType.PIPE, False),
+                    4: LevelInfo(LevelType.GIANT_PIPES, ExitType.CARD, False),
+                    5: LevelInfo(LevelType.FORTRESS, ExitType.BOOM_BOOM, False),
+                    6: LevelInfo(LevelType.PIRANHA_GARDEN, ExitType.FLAG, False),
+                    7: LevelInfo(LevelType.PIPE_MAZE, ExitType.CARD, True),
+                    8: LevelInfo(LevelType.FORTRESS, ExitType.BOOM_BOOM, False),
+                    9: LevelInfo(LevelType.FAST_PIPES, ExitType.FLAG, False),
+                    'piranha': LevelInfo(LevelType.PIRANHA_BOSS, ExitType.TREASURE, True),
+                    'castle': LevelInfo(LevelType.CASTLE, ExitType.BOSS, False),
+                    'airship': LevelInfo(LevelType.AIRSHIP, ExitType.AIRSHIP, False)
                 }
-            },
-            8: {  # Dark Land
-                'name': 'Dark Land',
-                'theme': 'dark',
-                'boss': 'Bowser',
-                'levels': {
-                    1: {'type': 'tanks', 'exit_type': 'flag', 'secret': False},
-                    2: {'type': 'battleships', 'exit_type': 'flag', 'secret': False},
-                    'fortress1': {'type': 'fortress', 'exit_type': 'boom_boom', 'secret': False},
-                    3: {'type': 'hand_traps', 'exit_type': 'flag', 'secret': False},
-                    'airforce': {'type': 'airship_fleet', 'exit_type': 'flag', 'secret': False},
-                    'fortress2': {'type': 'fortress', 'exit_type': 'boom_boom', 'secret': False},
-                    'super_tank': {'type': 'super_tank', 'exit_type': 'flag', 'secret': False},
-                    'bowser_castle': {'type': 'final_castle', 'exit_type': 'bowser', 'secret': False}
+            ),
+            8: World(  # Dark Land
+                name='Dark Land',
+                theme=Theme.DARK,
+                boss=Boss.BOWSER,
+                levels={
+                    1: LevelInfo(LevelType.TANKS, ExitType.FLAG, False),
+                    2: LevelInfo(LevelType.BATTLESHIPS, ExitType.FLAG, False),
+                    'fortress1': LevelInfo(LevelType.FORTRESS, ExitType.BOOM_BOOM, False),
+                    3: LevelInfo(LevelType.HAND_TRAPS, ExitType.FLAG, False),
+                    'airforce': LevelInfo(LevelType.AIRSHIP_FLEET, ExitType.FLAG, False),
+                    'fortress2': LevelInfo(LevelType.FORTRESS, ExitType.BOOM_BOOM, False),
+                    'super_tank': LevelInfo(LevelType.SUPER_TANK, ExitType.FLAG, False),
+                    'bowser_castle': LevelInfo(LevelType.FINAL_CASTLE, ExitType.BOSS, False)
                 }
-            }
+            )
         }
     
     # ============= LEVEL GENERATION =============
     def generate_level(self, world_num, level_num):
+        # Each (world, level) is generated once from a seed derived from its key;
+        # re-entries get a fresh copy so enemy/block state never leaks between tries
+        key = (world_num, level_num)
+        if key not in self._level_cache:
+            rng = np.random.default_rng(hash(key) & 0xFFFFFFFF)
+            self._level_cache[key] = self._build_level(world_num, level_num, rng)
+        return copy.deepcopy(self._level_cache[key])
+    
+    def _build_level(self, world_num, level_num, rng):
         world_data = self.worlds[world_num]
-        level_info = world_data['levels'].get(level_num, world_data['levels'][1])
-        
-        level = {
-            'platforms': [],
-            'enemies': [],
-            'powerups': [],
-            'pipes': [],
-            'blocks': [],
-            'decorations': [],
-            'checkpoints': [],
-            'exit': None
-        }
+        level_info = world_data.levels.get(level_num, world_data.levels[1])
         
-        # Generate based on level type
-        if level_info['type'] == 'standard':
-            level = self._generate_standard_level(world_num)
-        elif level_info['type'] == 'water' or level_info['type'] == 'underwater':
-            level = self._generate_water_level(world_num)
-        elif level_info['type'] == 'fortress':
-            level = self._generate_fortress_level(world_num)
-        elif level_info['type'] == 'castle':
-            level = self._generate_castle_level(world_num)
-        elif level_info['type'] == 'airship':
-            level = self._generate_airship_level(world_num)
-        elif level_info['type'] == 'giant':
-            level = self._generate_giant_level(world_num)
-        elif level_info['type'] == 'ice':
-            level = self._generate_ice_level(world_num)
-        elif level_info['type'] == 'pipes':
-            level = self._generate_pipe_level(world_num)
-        elif level_info['type'] == 'desert' or 'pyramid' in level_info['type']:
-            level = self._generate_desert_level(world_num)
-        elif level_info['type'] == 'clouds' or level_info['type'] == 'sky':
-            level = self._generate_sky_level(world_num)
-        elif level_info['type'] == 'tanks' or level_info['type'] == 'battleships':
-            level = self._generate_vehicle_level(world_num)
-        elif level_info['type'] == 'final_castle':
-            level = self._generate_bowser_castle()
-        else:
-            level = self._generate_standard_level(world_num)
+        # Generate based on level type; unknown types get a standard level
+        generator = self._LEVEL_GENERATORS.get(level_info.type, SMB3Engine._generate_standard_level)
+        level = generator(self, world_num, rng)
         
         # Add photonic enhancements
-        level['photonic_zones'] = self._add_photonic_zones(level_info['type'])
+        level.photonic_zones = self._add_photonic_zones(level_info.type, rng)
         
+        self._index_geometry(level)
         return level
     
-    def _generate_standard_level(self, world_num):
-        level = {
-            'platforms': [],
-            'enemies': [],
-            'powerups': [],
-            'pipes': [],
-            'blocks': [],
-            'decorations': [],
-            'checkpoints': []
-        }
+    def _index_geometry(self, level):
+        """Mirror platform/block/pipe rects into (N, 4) x1, y1, x2, y2 arrays
+        and resolve every item's draw color from its type"""
+        for key, colors, default in (('platforms', PLATFORM_COLORS, (100, 100, 100)),
+                                     ('blocks', BLOCK_COLORS, (100, 100, 100)),
+                                     ('pipes', PIPE_COLORS, (0, 150, 0))):
+            items = getattr(level, key)
+            xyxy = np.empty((len(items), 4), np.int32)
+            for i, item in enumerate(items):
+                rect = item.rect
+                xyxy[i] = rect.left, rect.top, rect.right, rect.bottom
+                item.color = colors.get(item.type, default)
+            setattr(level, key + '_xyxy', xyxy)
+            setattr(level, key + '_types', np.array([item.type.encode() for item in items], dtype='S16'))
+            
+            # x-sorted view for camera culling; the widest item bounds how far
+            # left of the camera a visible item can start
+            order = np.argsort(xyxy[:, 0], kind='stable')
+            reach = int((xyxy[:, 2] - xyxy[:, 0]).max()) if len(items) else 0
+            level.cull_index[key] = (order, xyxy[order, 0], reach)
+        for enemy in level.enemies:
+            enemy['color'] = ENEMY_COLORS.get(enemy['type'], (100, 100, 100))
+        level.platforms_collision = np.array([p.collision for p in level.platforms], dtype=bool)
+        level.platform_grid = self._build_grid(level.platforms_xyxy)
+    
+    def _visible_rows(self, level, key, camera_x):
+        """Level-order indices of key's items whose left edge could be on screen"""
+        order, xs, reach = level.cull_index[key]
+        lo = np.searchsorted(xs, camera_x - reach, side='right')
+        hi = np.searchsorted(xs, camera_x + SCREEN_WIDTH)
+        return np.sort(order[lo:hi]).tolist()
+    
+    def _build_grid(self, xyxy):
+        """Bucket row indices by every GRID_CELL-wide column their x span overlaps"""
+        grid = {}
+        first = (xyxy[:, 0] // GRID_CELL).tolist()
+        last = ((xyxy[:, 2] - 1) // GRID_CELL).tolist()
+        for i, (c0, c1) in enumerate(zip(first, last)):
+            for cx in range(c0, c1 + 1):
+                grid.setdefault(cx, []).append(i)
+        return {cx: np.array(rows, np.int64) for cx, rows in grid.items()}
+    
+    def _query_grid(self, grid, x1, x2):
+        """Ascending row indices sharing a grid column with the span [x1, x2)"""
+        c0, c1 = x1 // GRID_CELL, (x2 - 1) // GRID_CELL
+        if c0 == c1:
+            return grid.get(c0, self._NO_ROWS)
+        return np.unique(np.concatenate([grid.get(cx, self._NO_ROWS) for cx in range(c0, c1 + 1)]))
+    
+    def _generate_standard_level(self, world_num, rng):
+        level = Level()
         
-        # Generate terrain
+        # Draw every random decision for all terrain slots up front
         y_base = 500
-        for x in range(0, 4000, 200):
-            width = random.randint(150, 400)
-            height = random.randint(20, 100)
-            gap = random.randint(50, 150)
-            
+        xs = np.arange(0, 4000, 200)
+        n = xs.size
+        widths = rng.integers(150, 401, n)
+        heights = rng.integers(20, 101, n)
+        floating_mask = rng.random(n) > 0.5
+        enemy_mask = rng.random(n) > 0.3
+        enemy_types = rng.integers(0, 4, n)
+        block_mask = rng.random(n) > 0.4
+        block_rolls = rng.random((n, 10)) > 0.6
+        block_types = rng.integers(0, 3, (n, 10))
+        block_contents = rng.integers(0, 5, (n, 10))
+        pipe_mask = rng.random(n) > 0.7
+        pipe_heights = rng.integers(80, 201, n)
+        pipe_enterable = rng.random(n) > 0.7
+        pipe_bonus = rng.random(n) > 0.5
+        
+        enemy_kinds = ('goomba', 'koopa_green', 'koopa_red', 'hammer_bro')
+        block_kinds = ('brick', 'question', 'hidden')
+        contents = ('coin', 'mushroom', 'flower', 'star', 'leaf')
+        
+        # Build the rects from the precomputed columns
+        for s, (x, width, height) in enumerate(zip(xs.tolist(), widths.tolist(), heights.tolist())):
             # Main platform
-            level['platforms'].append({
-                'rect': pygame.Rect(x, y_base, width, height),
-                'type': 'ground',
-                'collision': True
-            })
+            level.platforms.append(Platform(pygame.Rect(x, y_base, width, height), 'ground'))
             
             # Floating platforms
-            if random.random() > 0.5:
-                level['platforms'].append({
-                    'rect': pygame.Rect(x + width//2, y_base - 150, 100, 20),
-                    'type': 'floating',
-                    'collision': True
-                })
+            if floating_mask[s]:
+                level.platforms.append(Platform(pygame.Rect(x + width//2, y_base - 150, 100, 20), 'floating'))
             
             # Add enemies
-            if random.random() > 0.3:
-                enemy_type = random.choice(['goomba', 'koopa_green', 'koopa_red', 'hammer_bro'])
-                level['enemies'].append({
-                    'type': enemy_type,
+            if enemy_mask[s]:
+                level.enemies.append({
+                    'type': enemy_kinds[enemy_types[s]],
                     'pos': [x + width//2, y_base - 50],
                     'vel': [-1, 0],
                     'patrol_range': [x, x + width]
                 })
             
             # Add blocks
-            if random.random() > 0.4:
+            if block_mask[s]:
                 block_y = y_base - 200
-                for bx in range(x, x + width, 40):
-                    if random.random() > 0.6:
-                        block_type = random.choice(['brick', 'question', 'hidden'])
-                        level['blocks'].append({
-                            'rect': pygame.Rect(bx, block_y, 40, 40),
-                            'type': block_type,
-                            'contains': random.choice(['coin', 'mushroom', 'flower', 'star', 'leaf'])
-                            if block_type == 'question' else 'coin',
-                            'hit': False
-                        })
+                for i, bx in enumerate(range(x, x + width, 40)):
+                    if block_rolls[s, i]:
+                        block_type = block_kinds[block_types[s, i]]
+                        level.blocks.append(Block(
+                            pygame.Rect(bx, block_y, 40, 40), block_type,
+                            contains=contents[block_contents[s, i]]
+                            if block_type == 'question' else 'coin'
+                        ))
             
             # Add pipes
-            if random.random() > 0.7:
-                pipe_height = random.randint(80, 200)
-                level['pipes'].append({
-                    'rect': pygame.Rect(x + width - 60, y_base - pipe_height, 60, pipe_height),
-                    'type': 'green',
-                    'enterable': random.random() > 0.7,
-                    'destination': 'bonus' if random.random() > 0.5 else 'secret'
-                })
+            if pipe_mask[s]:
+                pipe_height = int(pipe_heights[s])
+                level.pipes.append(Pipe(
+                    pygame.Rect(x + width - 60, y_base - pipe_height, 60, pipe_height), 'green',
+                    enterable=bool(pipe_enterable[s]),
+                    destination='bonus' if pipe_bonus[s] else 'secret'
+                ))
         
         return level
     
-    def _generate_water_level(self, world_num):
-        level = self._generate_standard_level(world_num)
-        level['water_line'] = 300
-        level['current'] = random.uniform(-0.5, 0.5)
+    def _generate_water_level(self, world_num, rng):
+        level = self._generate_standard_level(world_num, rng)
+        level.water_line = 300
+        level.current = float(rng.uniform(-0.5, 0.5))
         
         # Add water enemies
-        for i in range(20):
-            level['enemies'].append({
-                'type': random.choice(['cheep_cheep', 'blooper', 'big_bertha']),
-                'pos': [random.randint(100, 3900), random.randint(320, 500)],
-                'vel': [random.uniform(-2, 2), random.uniform(-1, 1)],
-                'patrol_range': [0, 4000]
-            })
+        water_kinds = ('cheep_cheep', 'blooper', 'big_bertha')
+        kinds = rng.integers(0, 3, 20)
+        pos = np.stack([rng.integers(100, 3901, 20), rng.integers(320, 501, 20)], 1)
+        vel = np.stack([rng.uniform(-2, 2, 20), rng.uniform(-1, 1, 20)], 1)
+        level.enemies.extend({
+            'type': water_kinds[k],
+            'pos': p,
+            'vel': v,
+            'patrol_range': [0, 4000]
+        } for k, p, v in zip(kinds.tolist(), pos.tolist(), vel.tolist()))
         
         return level
     
-    def _generate_fortress_level(self, world_num):
-        level = {
-            'platforms': [],
-            'enemies': [],
-            'powerups': [],
-            'blocks': [],
-            'hazards': [],
-            'checkpoints': []
-        }
+    def _generate_fortress_level(self, world_num, rng):
+        level = Level()
+        
+        # Thwomp / roto-disc / dry bones rolls for every section
+        xs = np.arange(0, 3000, 300)
+        thwomp_mask, disc_mask, bones_mask = rng.random((3, xs.size)) > [[0.6], [0.5], [0.4]]
         
         # Fortress architecture
-        for x in range(0, 3000, 300):
+        for s, x in enumerate(xs.tolist()):
             # Floor
-            level['platforms'].append({
-                'rect': pygame.Rect(x, 550, 300, 50),
-                'type': 'fortress_floor',
-                'collision': True
-            })
+            level.platforms.append(Platform(pygame.Rect(x, 550, 300, 50), 'fortress_floor'))
             
             # Ceiling
-            level['platforms'].append({
-                'rect': pygame.Rect(x, 0, 300, 50),
-                'type': 'fortress_ceiling',
-                'collision': True
-            })
+            level.platforms.append(Platform(pygame.Rect(x, 0, 300, 50), 'fortress_ceiling'))
             
             # Add thwomps
-            if random.random() > 0.6:
-                level['hazards'].append({
+            if thwomp_mask[s]:
+                level.hazards.append({
                     'type': 'thwomp',
                     'pos': [x + 150, 100],
                     'trigger_distance': 100,
@@ -431,8 +894,8 @@ class SMB3Engine:
                 })
             
             # Add roto-discs
-            if random.random() > 0.5:
-                level['hazards'].append({
+            if disc_mask[s]:
+                level.hazards.append({
                     'type': 'roto_disc',
                     'center': [x + 150, 300],
                     'radius': 100,
@@ -440,8 +903,8 @@ class SMB3Engine:
                 })
             
             # Add dry bones
-            if random.random() > 0.4:
-                level['enemies'].append({
+            if bones_mask[s]:
+                level.enemies.append({
                     'type': 'dry_bones',
                     'pos': [x + 100, 500],
                     'vel': [-0.5, 0],
@@ -449,202 +912,191 @@ class SMB3Engine:
                 })
         
         # Boss room
-        level['boss_room'] = {
+        level.boss_room = {
             'rect': pygame.Rect(2700, 200, 300, 350),
             'boss': 'boom_boom'
         }
         
         return level
     
-    def _generate_castle_level(self, world_num):
-        level = self._generate_fortress_level(world_num)
+    def _generate_castle_level(self, world_num, rng):
+        level = self._generate_fortress_level(world_num, rng)
         
         # Add lava
-        level['lava_y'] = 550
-        level['lava_bubbles'] = []
-        
-        for x in range(0, 3000, 200):
-            if random.random() > 0.6:
-                level['lava_bubbles'].append({
-                    'x': x,
-                    'timer': random.randint(0, 120),
-                    'height': random.randint(100, 300)
-                })
+        level.lava_y = 550
+        xs = np.arange(0, 3000, 200)
+        sel = xs[rng.random(xs.size) > 0.6]
+        timers = rng.integers(0, 121, sel.size)
+        heights = rng.integers(100, 301, sel.size)
+        level.lava_bubbles = [{
+            'x': x,
+            'timer': t,
+            'height': h
+        } for x, t, h in zip(sel.tolist(), timers.tolist(), heights.tolist())]
         
         # Koopa Kid boss room
-        koopa_kids = ['larry', 'morton', 'wendy', 'iggy', 'roy', 'lemmy', 'ludwig']
-        level['boss_room']['boss'] = koopa_kids[world_num - 1] if world_num <= 7 else 'bowser'
+        level.boss_room['boss'] = Boss(world_num).name.lower()
         
         return level
     
-    def _generate_airship_level(self, world_num):
-        level = {
-            'platforms': [],
-            'enemies': [],
-            'powerups': [],
-            'cannons': [],
-            'propellers': [],
-            'checkpoints': [],
-            'scroll_speed': 2
-        }
+    def _generate_airship_level(self, world_num, rng):
+        level = Level(scroll_speed=2)
+        
+        # Draw every segment's decisions up front
+        xs = np.arange(0, 5000, 500)
+        n = xs.size
+        mast_mask = rng.random(n) > 0.5
+        cannon_mask = rng.random((n, 4)) > 0.6
+        cannon_types = rng.integers(0, 3, (n, 4))
+        fire_rates = rng.integers(60, 181, (n, 4))
+        wrench_mask = rng.random(n) > 0.5
+        wrench_offsets = rng.integers(50, 351, n)
+        wrench_timers = rng.integers(0, 121, n)
+        cannon_kinds = ('standard', 'giant', 'rotating')
         
         # Airship segments
-        for x in range(0, 5000, 500):
+        for s, x in enumerate(xs.tolist()):
             # Deck
-            level['platforms'].append({
-                'rect': pygame.Rect(x, 400, 400, 30),
-                'type': 'airship_deck',
-                'collision': True
-            })
+            level.platforms.append(Platform(pygame.Rect(x, 400, 400, 30), 'airship_deck'))
             
             # Masts and platforms
-            if random.random() > 0.5:
-                level['platforms'].append({
-                    'rect': pygame.Rect(x + 200, 300, 100, 20),
-                    'type': 'mast_platform',
-                    'collision': True
-                })
+            if mast_mask[s]:
+                level.platforms.append(Platform(pygame.Rect(x + 200, 300, 100, 20), 'mast_platform'))
             
             # Cannons
-            for cx in range(x, x + 400, 100):
-                if random.random() > 0.6:
-                    level['cannons'].append({
-                        'pos': [cx, 380],
-                        'type': random.choice(['standard', 'giant', 'rotating']),
-                        'fire_rate': random.randint(60, 180)
-                    })
+            for c in np.flatnonzero(cannon_mask[s]).tolist():
+                level.cannons.append({
+                    'pos': [x + c * 100, 380],
+                    'type': cannon_kinds[cannon_types[s, c]],
+                    'fire_rate': int(fire_rates[s, c])
+                })
             
             # Rocky Wrench
-            if random.random() > 0.5:
-                level['enemies'].append({
+            if wrench_mask[s]:
+                level.enemies.append({
                     'type': 'rocky_wrench',
-                    'pos': [x + random.randint(50, 350), 400],
-                    'emerge_timer': random.randint(0, 120)
+                    'pos': [x + int(wrench_offsets[s]), 400],
+                    'emerge_timer': int(wrench_timers[s])
                 })
         
         return level
     
-    def _generate_giant_level(self, world_num):
-        level = self._generate_standard_level(world_num)
-        
-        # Scale everything up
-        for platform in level['platforms']:
-            platform['rect'].width *= 2
-            platform['rect'].height *= 2
-            platform['rect'].x *= 2
-            platform['rect'].y = (platform['rect'].y - 300) * 2 + 300
-        
-        for enemy in level['enemies']:
+    def _generate_giant_level(self, world_num, rng):
+        level = self._generate_standard_level(world_num, rng)
+        
+        # Scale everything up about y=300 as xyxy arrays, then rebuild the rects;
+        # _build_level indexes the scaled geometry afterwards
+        for key in ('platforms', 'blocks'):
+            xyxy = np.array([(item.rect.left, item.rect.top, item.rect.right, item.rect.bottom)
+                             for item in getattr(level, key)], dtype=np.int32).reshape(-1, 4)
+            xyxy[:, [0, 2]] *= 2
+            xyxy[:, [1, 3]] = (xyxy[:, [1, 3]] - 300) * 2 + 300
+            for item, (x1, y1, x2, y2) in zip(getattr(level, key), xyxy.tolist()):
+                item.rect = pygame.Rect(x1, y1, x2 - x1, y2 - y1)
+        
+        enemy_pos = np.array([enemy['pos'] for enemy in level.enemies], dtype=np.int64).reshape(-1, 2)
+        enemy_pos[:, 0] *= 2
+        enemy_pos[:, 1] = (enemy_pos[:, 1] - 300) * 2 + 300
+        for enemy, pos in zip(level.enemies, enemy_pos.tolist()):
             enemy['size_multiplier'] = 2
-            enemy['pos'][0] *= 2
-            enemy['pos'][1] = (enemy['pos'][1] - 300) * 2 + 300
-        
-        for block in level['blocks']:
-            block['rect'].width *= 2
-            block['rect'].height *= 2
-            block['rect'].x *= 2
-            block['rect'].y = (block['rect'].y - 300) * 2 + 300
+            enemy['pos'] = pos
         
         return level
     
-    def _generate_ice_level(self, world_num):
-        level = self._generate_standard_level(world_num)
+    def _generate_ice_level(self, world_num, rng):
+        level = self._generate_standard_level(world_num, rng)
         
         # Make all platforms slippery
-        for platform in level['platforms']:
-            platform['friction'] = 0.02  # Very low friction
-            platform['type'] = 'ice'
+        for platform in level.platforms:
+            platform.friction = 0.02  # Very low friction
+            platform.type = 'ice'
         
         # Add ice-specific enemies
-        level['enemies'] = []
-        for i in range(15):
-            level['enemies'].append({
-                'type': random.choice(['flurry', 'cooligan', 'ice_bro']),
-                'pos': [random.randint(200, 3800), random.randint(200, 400)],
-                'vel': [random.uniform(-1, 1), 0],
-                'patrol_range': [0, 4000]
-            })
+        ice_kinds = ('flurry', 'cooligan', 'ice_bro')
+        kinds = rng.integers(0, 3, 15)
+        pos = np.stack([rng.integers(200, 3801, 15), rng.integers(200, 401, 15)], 1)
+        vel_x = rng.uniform(-1, 1, 15)
+        level.enemies = [{
+            'type': ice_kinds[k],
+            'pos': p,
+            'vel': [vx, 0],
+            'patrol_range': [0, 4000]
+        } for k, p, vx in zip(kinds.tolist(), pos.tolist(), vel_x.tolist())]
         
         # Add icicles
-        level['hazards'] = []
-        for x in range(0, 4000, 150):
-            if random.random() > 0.6:
-                level['hazards'].append({
-                    'type': 'icicle',
-                    'pos': [x, 50],
-                    'falling': False,
-                    'trigger_distance': 50
-                })
+        xs = np.arange(0, 4000, 150)
+        level.hazards = [{
+            'type': 'icicle',
+            'pos': [x, 50],
+            'falling': False,
+            'trigger_distance': 50
+        } for x in xs[rng.random(xs.size) > 0.6].tolist()]
         
         return level
     
-    def _generate_pipe_level(self, world_num):
-        level = {
-            'platforms': [],
-            'pipes': [],
-            'enemies': [],
-            'powerups': [],
-            'pipe_network': {},
-            'checkpoints': []
-        }
+    def _generate_pipe_level(self, world_num, rng):
+        level = Level()
+        
+        # Draw every maze slot's decisions up front; slots are visited
+        # column-major, so pipe ids follow the placed slots in order
+        slots = [(x, y) for x in range(0, 4000, 250) for y in range(100, 500, 150)]
+        n = len(slots)
+        pipe_mask = rng.random(n) > 0.3
+        pipe_heights = rng.integers(60, 201, n)
+        orientations = rng.integers(0, 4, n)
+        colors = rng.integers(0, 3, n)
+        connect_mask = rng.random(n) > 0.5
+        connect_rolls = rng.random(n)
+        piranha_mask = rng.random(n) > 0.5
+        emerge_timers = rng.integers(0, 181, n)
+        orientation_kinds = ('up', 'down', 'left', 'right')
+        color_kinds = ('green', 'red', 'yellow')
         
         # Create pipe maze
         pipe_id = 0
-        for x in range(0, 4000, 250):
-            for y in range(100, 500, 150):
-                if random.random() > 0.3:
-                    pipe_height = random.randint(60, 200)
-                    orientation = random.choice(['up', 'down', 'left', 'right'])
-                    
-                    pipe = {
-                        'rect': pygame.Rect(x, y, 60, pipe_height),
-                        'type': random.choice(['green', 'red', 'yellow']),
-                        'orientation': orientation,
-                        'id': pipe_id,
-                        'connected_to': None
-                    }
-                    
-                    # Create connections
-                    if pipe_id > 0 and random.random() > 0.5:
-                        pipe['connected_to'] = random.randint(0, pipe_id - 1)
-                    
-                    level['pipes'].append(pipe)
-                    pipe_id += 1
-                    
-                    # Add piranha plants
-                    if random.random() > 0.5:
-                        level['enemies'].append({
-                            'type': 'piranha_plant',
-                            'pipe_id': pipe_id - 1,
-                            'pos': [x + 30, y],
-                            'emerge_timer': random.randint(0, 180)
-                        })
+        for s in np.flatnonzero(pipe_mask).tolist():
+            x, y = slots[s]
+            pipe = Pipe(pygame.Rect(x, y, 60, int(pipe_heights[s])), color_kinds[colors[s]],
+                        orientation=orientation_kinds[orientations[s]], id=pipe_id)
+            
+            # Create connections to any earlier pipe
+            if pipe_id > 0 and connect_mask[s]:
+                pipe.connected_to = int(connect_rolls[s] * pipe_id)
+            
+            level.pipes.append(pipe)
+            pipe_id += 1
+            
+            # Add piranha plants
+            if piranha_mask[s]:
+                level.enemies.append({
+                    'type': 'piranha_plant',
+                    'pipe_id': pipe_id - 1,
+                    'pos': [x + 30, y],
+                    'emerge_timer': int(emerge_timers[s])
+                })
         
         # Add platforms between pipes
-        for x in range(0, 4000, 200):
-            if random.random() > 0.4:
-                level['platforms'].append({
-                    'rect': pygame.Rect(x, random.randint(300, 500), 150, 20),
-                    'type': 'metal',
-                    'collision': True
-                })
+        xs = np.arange(0, 4000, 200)
+        sel = xs[rng.random(xs.size) > 0.4]
+        ys = rng.integers(300, 501, sel.size)
+        level.platforms = [Platform(pygame.Rect(x, y, 150, 20), 'metal')
+                           for x, y in zip(sel.tolist(), ys.tolist())]
         
         return level
     
-    def _generate_desert_level(self, world_num):
-        level = self._generate_standard_level(world_num)
-        
-        # Add quicksand
-        level['quicksand'] = []
-        for x in range(500, 3500, 300):
-            if random.random() > 0.6:
-                level['quicksand'].append({
-                    'rect': pygame.Rect(x, 500, 200, 100),
-                    'sink_speed': 0.5
-                })
+    def _generate_desert_level(self, world_num, rng):
+        level = self._generate_standard_level(world_num, rng)
+        
+        # Add quicksand; rects are built in one pass from the selected slots
+        xs = np.arange(500, 3500, 300)
+        sel = xs[rng.random(xs.size) > 0.6]
+        level.quicksand_xyxy = np.stack(
+            [sel, np.full_like(sel, 500), sel + 200, np.full_like(sel, 600)], 1).astype(np.int32)
+        level.quicksand = [{'rect': pygame.Rect(x, 500, 200, 100), 'sink_speed': 0.5}
+                              for x in sel.tolist()]
         
         # Add angry sun
-        level['angry_sun'] = {
+        level.angry_sun = {
             'active': True,
             'pos': [400, 100],
             'attack_timer': 0,
@@ -652,124 +1104,123 @@ class SMB3Engine:
         }
         
         # Add desert enemies
-        for enemy in level['enemies']:
-            enemy['type'] = random.choice(['pokey', 'lakitu', 'spiny', 'fire_snake'])
+        desert_kinds = ('pokey', 'lakitu', 'spiny', 'fire_snake')
+        for enemy, k in zip(level.enemies, rng.integers(0, 4, len(level.enemies)).tolist()):
+            enemy['type'] = desert_kinds[k]
         
         return level
     
-    def _generate_sky_level(self, world_num):
-        level = {
-            'platforms': [],
-            'enemies': [],
-            'powerups': [],
-            'clouds': [],
-            'checkpoints': []
-        }
+    def _generate_sky_level(self, world_num, rng):
+        level = Level()
         
         # Cloud platforms
-        for x in range(0, 5000, 200):
-            y = random.randint(100, 450)
-            level['clouds'].append({
-                'rect': pygame.Rect(x, y, random.randint(100, 250), 30),
-                'type': random.choice(['solid', 'bouncy', 'moving']),
-                'collision': True,
-                'speed': random.uniform(-1, 1) if random.random() > 0.7 else 0
-            })
+        xs = np.arange(0, 5000, 200)
+        ys = rng.integers(100, 451, xs.size)
+        widths = rng.integers(100, 251, xs.size)
+        kinds = rng.integers(0, 3, xs.size)
+        speeds = np.where(rng.random(xs.size) > 0.7, rng.uniform(-1, 1, xs.size), 0.0)
+        cloud_kinds = ('solid', 'bouncy', 'moving')
+        level.clouds_xyxy = np.stack([xs, ys, xs + widths, ys + 30], 1).astype(np.int32)
+        level.clouds = [{
+            'rect': pygame.Rect(x, y, w, 30),
+            'type': cloud_kinds[k],
+            'collision': True,
+            'speed': speed
+        } for x, y, w, k, speed in zip(xs.tolist(), ys.tolist(), widths.tolist(),
+                                       kinds.tolist(), speeds.tolist())]
         
         # Flying enemies
-        for i in range(30):
-            level['enemies'].append({
-                'type': random.choice(['paragoomba', 'paratroopa', 'lakitu', 'parabeetle']),
-                'pos': [random.randint(100, 4900), random.randint(50, 400)],
-                'vel': [random.uniform(-2, 2), random.uniform(-1, 1)],
-                'patrol_range': [0, 5000]
-            })
+        flyer_kinds = ('paragoomba', 'paratroopa', 'lakitu', 'parabeetle')
+        kinds = rng.integers(0, 4, 30)
+        pos = np.stack([rng.integers(100, 4901, 30), rng.integers(50, 401, 30)], 1)
+        vel = np.stack([rng.uniform(-2, 2, 30), rng.uniform(-1, 1, 30)], 1)
+        level.enemies = [{
+            'type': flyer_kinds[k],
+            'pos': p,
+            'vel': v,
+            'patrol_range': [0, 5000]
+        } for k, p, v in zip(kinds.tolist(), pos.tolist(), vel.tolist())]
         
         # Donut lifts
-        for x in range(500, 4500, 400):
-            if random.random() > 0.5:
-                level['platforms'].append({
-                    'rect': pygame.Rect(x, random.randint(200, 400), 80, 20),
-                    'type': 'donut_lift',
-                    'collision': True,
-                    'fall_timer': 0,
-                    'falling': False
-                })
+        xs = np.arange(500, 4500, 400)
+        sel = xs[rng.random(xs.size) > 0.5]
+        ys = rng.integers(200, 401, sel.size)
+        level.platforms = [Platform(pygame.Rect(x, y, 80, 20), 'donut_lift')
+                           for x, y in zip(sel.tolist(), ys.tolist())]
         
         return level
     
-    def _generate_vehicle_level(self, world_num):
-        level = {
-            'platforms': [],
-            'enemies': [],
-            'cannons': [],
-            'vehicles': [],
-            'scroll_speed': 3,
-            'checkpoints': []
-        }
+    def _generate_vehicle_level(self, world_num, rng):
+        level = Level(scroll_speed=3)
+        
+        # Draw every vehicle's decisions up front
+        xs = np.arange(0, 6000, 600)
+        n = xs.size
+        vehicle_types = rng.integers(0, 2, n)
+        cannon_mask = rng.random((n, 5)) > 0.4
+        fire_timers = rng.integers(0, 121, (n, 5))
+        flame_mask = rng.random(n) > 0.6
+        directions = rng.integers(0, 2, n)
+        patterns = rng.integers(0, 3, n)
+        level.vehicles_xyxy = np.stack(
+            [xs, np.full_like(xs, 450), xs + 500, np.full_like(xs, 550)], 1).astype(np.int32)
+        
+        vehicle_kinds = ('tank', 'battleship')
+        direction_kinds = ('up', 'diagonal')
+        pattern_kinds = ('continuous', 'burst', 'wave')
         
         # Generate tanks/ships
-        for x in range(0, 6000, 600):
-            vehicle_type = random.choice(['tank', 'battleship'])
-            vehicle = {
+        for s, x in enumerate(xs.tolist()):
+            level.vehicles.append({
                 'rect': pygame.Rect(x, 450, 500, 100),
-                'type': vehicle_type,
-                'cannons': [],
+                'type': vehicle_kinds[vehicle_types[s]],
+                'cannons': [{
+                    'offset': [c * 100, -20],
+                    'type': 'rotating',
+                    'angle': 0,
+                    'fire_timer': int(fire_timers[s, c])
+                } for c in np.flatnonzero(cannon_mask[s]).tolist()],
                 'collision': True
-            }
-            
-            # Add cannons to vehicle
-            for cx in range(0, 500, 100):
-                if random.random() > 0.4:
-                    vehicle['cannons'].append({
-                        'offset': [cx, -20],
-                        'type': 'rotating',
-                        'angle': 0,
-                        'fire_timer': random.randint(0, 120)
-                    })
-            
-            level['vehicles'].append(vehicle)
+            })
             
             # Add flame jets
-            if random.random() > 0.6:
-                level['enemies'].append({
+            if flame_mask[s]:
+                level.enemies.append({
                     'type': 'flame_jet',
                     'pos': [x + 250, 430],
-                    'direction': random.choice(['up', 'diagonal']),
-                    'fire_pattern': random.choice(['continuous', 'burst', 'wave'])
+                    'direction': direction_kinds[directions[s]],
+                    'fire_pattern': pattern_kinds[patterns[s]]
                 })
         
         return level
     
-    def _generate_bowser_castle(self):
-        level = {
-            'platforms': [],
-            'enemies': [],
-            'hazards': [],
-            'bowser_arena': None,
-            'checkpoints': []
-        }
+    def _generate_bowser_castle(self, rng):
+        level = Level()
+        
+        # Draw every gauntlet section's decisions up front
+        xs = np.arange(0, 3000, 200)
+        destructibles = rng.random(xs.size) > 0.7
+        hazard_types = rng.integers(0, 4, xs.size)
+        hazard_ys = rng.integers(100, 401, xs.size)
+        hazard_kinds = ('firebar', 'thwomp', 'laser', 'spike_ceiling')
         
         # Pre-boss gauntlet
-        for x in range(0, 3000, 200):
+        for x, destructible, k, y in zip(xs.tolist(), destructibles.tolist(),
+                                         hazard_types.tolist(), hazard_ys.tolist()):
             # Platforms
-            level['platforms'].append({
-                'rect': pygame.Rect(x, 500, 150, 50),
-                'type': 'castle_block',
-                'collision': True,
-                'destructible': random.random() > 0.7
-            })
+            level.platforms.append(Platform(pygame.Rect(x, 500, 150, 50), 'castle_block',
+                                            destructible=destructible))
             
             # Hazards
-            hazard_type = random.choice(['firebar', 'thwomp', 'laser', 'spike_ceiling'])
-            level['hazards'].append({
+            hazard_type = hazard_kinds[k]
+            level.hazards.append({
                 'type': hazard_type,
-                'pos': [x + 75, random.randint(100, 400)],
-                'params': self._get_hazard_params(hazard_type)
+                'pos': [x + 75, y],
+                'params': self._get_hazard_params(hazard_type, rng)
             })
         
         # Bowser arena
-        level['bowser_arena'] = {
+        level.bowser_arena = {
             'rect': pygame.Rect(3000, 200, 800, 400),
             'floor_blocks': [],
             'bowser_spawn': [3400, 300],
@@ -778,7 +1229,7 @@ class SMB3Engine:
         
         # Destructible floor
         for x in range(3000, 3800, 40):
-            level['bowser_arena']['floor_blocks'].append({
+            level.bowser_arena['floor_blocks'].append({
                 'rect': pygame.Rect(x, 500, 40, 100),
                 'hp': 3,
                 'destroyed': False
@@ -786,40 +1237,68 @@ class SMB3Engine:
         
         return level
     
-    def _get_hazard_params(self, hazard_type):
-        params = {
-            'firebar': {'length': random.randint(3, 6), 'speed': random.uniform(0.02, 0.05)},
-            'thwomp': {'trigger_distance': 100, 'fall_speed': 12},
-            'laser': {'charge_time': 60, 'fire_duration': 30, 'beam_width': 10},
-            'spike_ceiling': {'fall_speed': 2, 'rise_speed': 1}
-        }
-        return params.get(hazard_type, {})
+    _NO_ROWS = np.empty(0, np.int64)
+    
+    # Level type -> generator, called as generator(self, world_num, rng)
+    _LEVEL_GENERATORS = {
+        LevelType.STANDARD: _generate_standard_level,
+        LevelType.WATER: _generate_water_level,
+        LevelType.UNDERWATER: _generate_water_level,
+        LevelType.FORTRESS: _generate_fortress_level,
+        LevelType.CASTLE: _generate_castle_level,
+        LevelType.AIRSHIP: _generate_airship_level,
+        LevelType.GIANT: _generate_giant_level,
+        LevelType.ICE: _generate_ice_level,
+        LevelType.PIPES: _generate_pipe_level,
+        LevelType.DESERT: _generate_desert_level,
+        LevelType.PYRAMID: _generate_desert_level,
+        LevelType.PYRAMID_INSIDE: _generate_desert_level,
+        LevelType.CLOUDS: _generate_sky_level,
+        LevelType.SKY: _generate_sky_level,
+        LevelType.TANKS: _generate_vehicle_level,
+        LevelType.BATTLESHIPS: _generate_vehicle_level,
+        LevelType.FINAL_CASTLE: lambda self, world_num, rng: self._generate_bowser_castle(rng)
+    }
     
-    def _add_photonic_zones(self, level_type):
+    # Fixed parameters per hazard; firebars also roll a length and speed
+    _HAZARD_PARAMS = {
+        'thwomp': {'trigger_distance': 100, 'fall_speed': 12},
+        'laser': {'charge_time': 60, 'fire_duration': 30, 'beam_width': 10},
+        'spike_ceiling': {'fall_speed': 2, 'rise_speed': 1}
+    }
+    
+    def _get_hazard_params(self, hazard_type, rng):
+        if hazard_type == 'firebar':
+            return {'length': int(rng.integers(3, 7)), 'speed': float(rng.uniform(0.02, 0.05))}
+        return dict(self._HAZARD_PARAMS.get(hazard_type, {}))
+    
+    def _add_photonic_zones(self, level_type, rng):
         zones = []
         
         # Define photonic enhancement zones based on level type
         zone_configs = {
-            'standard': {'particle_density': 500, 'color': (100, 255, 100), 'effect': 'nature'},
-            'water': {'particle_density': 1000, 'color': (100, 150, 255), 'effect': 'caustics'},
-            'fortress': {'particle_density': 300, 'color': (255, 100, 100), 'effect': 'embers'},
-            'castle': {'particle_density': 800, 'color': (255, 150, 50), 'effect': 'lava_glow'},
-            'airship': {'particle_density': 600, 'color': (200, 200, 255), 'effect': 'wind_particles'},
-            'ice': {'particle_density': 700, 'color': (200, 230, 255), 'effect': 'snow'},
-            'pipes': {'particle_density': 400, 'color': (50, 255, 50), 'effect': 'steam'},
-            'desert': {'particle_density': 900, 'color': (255, 220, 150), 'effect': 'sand'},
-            'clouds': {'particle_density': 1200, 'color': (255, 255, 255), 'effect': 'cloud_wisps'},
-            'final_castle': {'particle_density': 1500, 'color': (255, 50, 50), 'effect': 'chaos'}
+            LevelType.STANDARD: {'particle_density': 500, 'color': (100, 255, 100), 'effect': 'nature'},
+            LevelType.WATER: {'particle_density': 1000, 'color': (100, 150, 255), 'effect': 'caustics'},
+            LevelType.FORTRESS: {'particle_density': 300, 'color': (255, 100, 100), 'effect': 'embers'},
+            LevelType.CASTLE: {'particle_density': 800, 'color': (255, 150, 50), 'effect': 'lava_glow'},
+            LevelType.AIRSHIP: {'particle_density': 600, 'color': (200, 200, 255), 'effect': 'wind_particles'},
+            LevelType.ICE: {'particle_density': 700, 'color': (200, 230, 255), 'effect': 'snow'},
+            LevelType.PIPES: {'particle_density': 400, 'color': (50, 255, 50), 'effect': 'steam'},
+            LevelType.DESERT: {'particle_density': 900, 'color': (255, 220, 150), 'effect': 'sand'},
+            LevelType.CLOUDS: {'particle_density': 1200, 'color': (255, 255, 255), 'effect': 'cloud_wisps'},
+            LevelType.FINAL_CASTLE: {'particle_density': 1500, 'color': (255, 50, 50), 'effect': 'chaos'}
         }
         
-        config = zone_configs.get(level_type, zone_configs['standard'])
+        config = zone_configs.get(level_type, zone_configs[LevelType.STANDARD])
         
         # Create zones throughout level
-        for x in range(0, 5000, 500):
+        xs = range(0, 5000, 500)
+        intensities = rng.uniform(0.5, 1.0, len(xs))
+        for x, intensity in zip(xs, intensities.tolist()):
             zones.append({
                 'rect': pygame.Rect(x, 0, 500, 600),
                 'config': config,
-                'intensity': random.uniform(0.5, 1.0)
+                'intensity': intensity
             })
         
         return zones
@@ -835,132 +1314,117 @@ class SMB3Engine:
         elif self.state == GameState.AIRSHIP:
             self.render_airship()
     
+    def _build_gradient(self):
+        """Pre-render the level background gradient into a surface"""
+        gradient = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT)).convert()
+        c = (50 + np.arange(SCREEN_HEIGHT) / SCREEN_HEIGHT * 150).astype(np.uint8)
+        pixels = pygame.surfarray.pixels3d(gradient)
+        pixels[:, :, 0] = c // 3
+        pixels[:, :, 1] = c // 2
+        pixels[:, :, 2] = c
+        del pixels  # Release the surface lock
+        return gradient
+    
+    def _paint_level(self, level):
+        """Pre-render platforms and blocks over the gradient, and pipes on a colorkeyed layer"""
+        # Cover every item plus a pipe top's overhang
+        width = max([int(xyxy[:, 2].max()) + 10 for xyxy in
+                     (level.platforms_xyxy, level.blocks_xyxy, level.pipes_xyxy) if len(xyxy)]
+                    + [SCREEN_WIDTH])
+        
+        background = pygame.Surface((width, SCREEN_HEIGHT)).convert()
+        for x in range(0, width, SCREEN_WIDTH):
+            background.blit(self._bg_gradient, (x, 0))
+        for platform in level.platforms:
+            pygame.draw.rect(background, platform.color, platform.rect)
+        for block in level.blocks:
+            if block.type != 'hidden' and not block.hit:
+                pygame.draw.rect(background, block.color, block.rect)
+        level.background = background
+        
+        if level.pipes:
+            foreground = pygame.Surface((width, SCREEN_HEIGHT)).convert()
+            foreground.fill((255, 0, 255))
+            foreground.set_colorkey((255, 0, 255), pygame.RLEACCEL)
+            for pipe in level.pipes:
+                rect = pipe.rect
+                pipe_color = pipe.color
+                pygame.draw.rect(foreground, pipe_color, rect)
+                pygame.draw.rect(foreground, (0, 0, 0), rect, 3)
+                
+                # Pipe top
+                top_rect = pygame.Rect(rect.x - 10, rect.y, rect.width + 20, 30)
+                pygame.draw.rect(foreground, pipe_color, top_rect)
+                pygame.draw.rect(foreground, (0, 0, 0), top_rect, 3)
+            level.foreground = foreground
+    
     def render_level(self):
-        # Background gradient with photonic enhancement
-        for y in range(SCREEN_HEIGHT):
-            color_val = int(50 + (y/SCREEN_HEIGHT) * 150)
-            pygame.draw.line(self.screen, 
-                           (color_val//3, color_val//2, color_val),
-                           (0, y), (SCREEN_WIDTH, y))
-        
         if not self.current_level_data:
+            # Background gradient with photonic enhancement
+            self.screen.blit(self._bg_gradient, (0, 0))
             return
         
-        # Camera offset
-        camera_x = max(0, self.mario['pos'][0] - SCREEN_WIDTH//2)
-        
-        # Render platforms with photonic edges
-        for platform in self.current_level_data.get('platforms', []):
-            rect = platform['rect'].copy()
-            rect.x -= camera_x
+        # Camera offset (whole pixels, so the static strips line up)
+        camera_x = int(max(0, self.mario['pos'][0] - SCREEN_WIDTH//2))
+        
+        # Static geometry comes from the pre-rendered level strip
+        level = self.current_level_data
+        if level.background is None:
+            self._paint_level(level)
+        if camera_x + SCREEN_WIDTH > level.background.get_width():
+            self.screen.blit(self._bg_gradient, (0, 0))  # Past the end of the strip
+        self.screen.blit(level.background, (0, 0), (camera_x, 0, SCREEN_WIDTH, SCREEN_HEIGHT))
+        
+        # Photon bursts are queued as (x, y, count, color, spread) rows and
+        # emitted in one batch before the particle update
+        bursts = []
+        rng = self.photonic.rng
+        
+        # Photonic edges on visible platforms
+        for i in self._visible_rows(level, 'platforms', camera_x):
+            platform = level.platforms[i]
+            rect = platform.rect.move(-camera_x, 0)
             
             if rect.right > 0 and rect.left < SCREEN_WIDTH:
-                # Platform base
-                color = {
-                    'ground': (139, 69, 19),
-                    'ice': (200, 230, 255),
-                    'metal': (150, 150, 150),
-                    'fortress_floor': (100, 100, 100),
-                    'castle_block': (80, 80, 80),
-                    'airship_deck': (120, 80, 40)
-                }.get(platform['type'], (100, 100, 100))
-                
-                pygame.draw.rect(self.screen, color, rect)
-                
-                # Photonic edge glow
-                for i in range(5):
-                    px = rect.x + random.randint(0, rect.width)
-                    py = rect.y
-                    self.photonic.emit_photon_burst(px, py, 3, color, 2)
-        
-        # Render blocks
-        for block in self.current_level_data.get('blocks', []):
-            if not block['hit']:
-                rect = block['rect'].copy()
-                rect.x -= camera_x
+                color = platform.color
+                for px in (rect.x + rng.integers(0, rect.width + 1, 5)).tolist():
+                    bursts.append((px, rect.y, 3, color, 2))
+        
+        # Question block animation
+        glow = abs(math.sin(pygame.time.get_ticks() * 0.005)) * 50
+        for i in self._visible_rows(level, 'blocks', camera_x):
+            block = level.blocks[i]
+            if block.type == 'question' and not block.hit:
+                rect = block.rect.move(-camera_x, 0)
                 
                 if rect.right > 0 and rect.left < SCREEN_WIDTH:
-                    color = {
-                        'brick': (150, 75, 0),
-                        'question': (255, 200, 0) if not block['hit'] else (100, 100, 100),
-                        'hidden': (0, 0, 0, 0)
-                    }.get(block['type'], (100, 100, 100))
-                    
-                    if block['type'] != 'hidden' or block['hit']:
-                        pygame.draw.rect(self.screen, color, rect)
-                        
-                        # Question block animation
-                        if block['type'] == 'question' and not block['hit']:
-                            glow = abs(math.sin(pygame.time.get_ticks() * 0.005)) * 50
-                            self.photonic.emit_photon_burst(
-                                rect.centerx, rect.centery, 
-                                int(glow/10), (255, 255, 100), 3
-                            )
+                    bursts.append((rect.centerx, rect.centery, int(glow/10), (255, 255, 100), 3))
         
         # Render enemies with trails
-        for enemy in self.current_level_data.get('enemies', []):
+        for enemy in level.enemies:
             ex = enemy['pos'][0] - camera_x
             ey = enemy['pos'][1]
             
             if 0 < ex < SCREEN_WIDTH:
-                enemy_colors = {
-                    'goomba': (150, 75, 0),
-                    'koopa_green': (0, 200, 0),
-                    'koopa_red': (200, 0, 0),
-                    'hammer_bro': (50, 150, 50),
-                    'dry_bones': (200, 200, 200),
-                    'lakitu': (100, 100, 100),
-                    'piranha_plant': (200, 0, 0)
-                }
-                
-                color = enemy_colors.get(enemy['type'], (100, 100, 100))
+                color = enemy['color']
                 size = enemy.get('size_multiplier', 1)
                 
                 pygame.draw.rect(self.screen, color,
                                (ex, ey, 30*size, 30*size))
                 
                 # Enemy particle trail
-                self.photonic.emit_photon_burst(
-                    ex + 15*size, ey + 30*size,
-                    5, color, 3
-                )
+                bursts.append((ex + 15*size, ey + 30*size, 5, color, 3))
         
-        # Render pipes
-        for pipe in self.current_level_data.get('pipes', []):
-            rect = pipe['rect'].copy()
-            rect.x -= camera_x
-            
-            if rect.right > 0 and rect.left < SCREEN_WIDTH:
-                pipe_color = {
-                    'green': (0, 200, 0),
-                    'red': (200, 0, 0),
-                    'yellow': (200, 200, 0)
-                }.get(pipe['type'], (0, 150, 0))
-                
-                pygame.draw.rect(self.screen, pipe_color, rect)
-                pygame.draw.rect(self.screen, (0, 0, 0), rect, 3)
-                
-                # Pipe top
-                top_rect = pygame.Rect(rect.x - 10, rect.y, rect.width + 20, 30)
-                pygame.draw.rect(self.screen, pipe_color, top_rect)
-                pygame.draw.rect(self.screen, (0, 0, 0), top_rect, 3)
+        # Pipes sit in front of enemies on their own colorkeyed strip
+        if level.pipes:
+            self.screen.blit(level.foreground, (0, 0), (camera_x, 0, SCREEN_WIDTH, SCREEN_HEIGHT))
         
         # Render Mario with power-up state
         mx = self.mario['pos'][0] - camera_x
         my = self.mario['pos'][1]
         
         if 0 <= mx <= SCREEN_WIDTH:
-            mario_colors = {
-                PowerUp.SMALL: (255, 0, 0),
-                PowerUp.SUPER: (255, 0, 0),
-                PowerUp.FIRE: (255, 100, 100),
-                PowerUp.RACCOON: (150, 75, 0),
-                PowerUp.TANOOKI: (150, 100, 50),
-                PowerUp.HAMMER: (100, 100, 100),
-                PowerUp.FROG: (0, 200, 0)
-            }
-            
-            color = mario_colors.get(self.mario['power'], (255, 0, 0))
+            color = MARIO_COLORS.get(self.mario['power'], (255, 0, 0))
             height = 40 if self.mario['power'] != PowerUp.SMALL else 30
             
             pygame.draw.rect(self.screen, color, (mx, my, 30, height))
@@ -972,53 +1436,40 @@ class SMB3Engine:
                                (mx - 15, my - 10, meter_width, 5))
                 
                 # Speed particles
-                for i in range(int(self.mario['p_meter'] / 20)):
-                    self.photonic.emit_photon_burst(
-                        mx, my + height,
-                        10, (255, 255, 100), 5
-                    )
+                bursts.append((mx, my + height, 10 * int(self.mario['p_meter'] / 20), (255, 255, 100), 5))
             
             # Invincibility stars
             if self.mario['invincible'] > 0:
+                base = int(pygame.time.get_ticks() * 0.01)
+                star_colors = self._star_palette.take(range(base, base + 10), axis=0, mode='wrap').tolist()
                 for i in range(10):
-                    angle = (pygame.time.get_ticks() * 0.01 + i * 36) % 360
-                    sx = mx + 15 + math.cos(math.radians(angle)) * 40
-                    sy = my + height//2 + math.sin(math.radians(angle)) * 40
-                    self.photonic.emit_photon_burst(sx, sy, 5, 
-                                                   (random.randint(100, 255),
-                                                    random.randint(100, 255),
-                                                    random.randint(100, 255)), 2)
+                    angle = (base + i * 36) % 360
+                    sx = mx + 15 + COS_TABLE[angle] * 40
+                    sy = my + height//2 + SIN_TABLE[angle] * 40
+                    bursts.append((sx, sy, 5, star_colors[i], 2))
         
         # Update and render particles
-        self.photonic.evolve_particles()
-        for particle in self.photonic.particles[:]:
-            particle['pos'][0] += particle['vel'][0]
-            particle['pos'][1] += particle['vel'][1]
-            particle['vel'][1] += 0.1  # Gravity
-            particle['life'] -= 2
-            
-            if particle['life'] <= 0:
-                self.photonic.particles.remove(particle)
-            else:
-                # Render particle with gaussian splat
-                px = particle['pos'][0] - camera_x
-                py = particle['pos'][1]
-                
-                if 0 <= px <= SCREEN_WIDTH:
-                    alpha = particle['life']
-                    color = tuple(particle['color'])
-                    
-                    # Gaussian blur effect
-                    for dx in range(-3, 4):
-                        for dy in range(-3, 4):
-                            dist = math.sqrt(dx*dx + dy*dy)
-                            if dist < 3:
-                                blur_alpha = int(alpha * math.exp(-dist*dist/2))
-                                if blur_alpha > 0:
-                                    s = pygame.Surface((2, 2))
-                                    s.set_alpha(blur_alpha)
-                                    s.fill(color)
-                                    self.screen.blit(s, (px + dx, py + dy))
+        photonic = self.photonic
+        if bursts:
+            xs, ys, counts, colors, spreads = zip(*bursts)
+            photonic.emit_bulk(xs, ys, counts, colors, spreads)
+        photonic.evolve_particles()
+        photonic.update_particles(0.1, 2)  # Gravity, life decay
+        n = photonic.n
+        xs = photonic.pos[:n, 0] - camera_x
+        ys = photonic.pos[:n, 1]
+        visible = np.flatnonzero((xs >= 0) & (xs <= SCREEN_WIDTH) &
+                                 (ys > -SPLAT_RADIUS) & (ys < SCREEN_HEIGHT + SPLAT_RADIUS))
+        if len(visible):
+            # One pre-baked Gaussian per (color, brightness), added onto the frame
+            splat = photonic.splat_sprite
+            add = pygame.BLEND_RGBA_ADD
+            self.screen.blits([
+                (splat(key), (x, y), None, add)
+                for key, x, y in zip(photonic.splat_keys(visible).tolist(),
+                                     (xs[visible].astype(np.int32) - SPLAT_RADIUS).tolist(),
+                                     (ys[visible].astype(np.int32) - SPLAT_RADIUS).tolist())
+            ], doreturn=False)
         
         # HUD
         self.render_hud()
@@ -1040,13 +1491,12 @@ class SMB3Engine:
         self.screen.fill(bg_color)
         
         # Draw world name
-        font = pygame.font.Font(None, 48)
-        world_name = self.worlds[self.current_world]['name']
-        text = font.render(world_name, True, (255, 255, 255))
+        world_name = self.worlds[self.current_world].name
+        text = self._text(world_name, (255, 255, 255), self.font_large)
         self.screen.blit(text, (SCREEN_WIDTH//2 - text.get_width()//2, 50))
         
         # Draw level nodes
-        levels = self.worlds[self.current_world]['levels']
+        levels = self.worlds[self.current_world].levels
         node_positions = self._calculate_node_positions(len(levels))
         
         for i, (level_key, level_data) in enumerate(levels.items()):
@@ -1063,8 +1513,7 @@ class SMB3Engine:
             
             # Level label
             label = str(level_key) if isinstance(level_key, int) else level_key[:3].upper()
-            font = pygame.font.Font(None, 16)
-            text = font.render(label, True, (0, 0, 0))
+            text = self._text(label, (0, 0, 0), self.font_tiny)
             self.screen.blit(text, (x - 10, y - 8))
             
             # Draw paths between nodes
@@ -1075,11 +1524,10 @@ class SMB3Engine:
             
             # Add photonic effects to current node
             if i == self.current_level - 1:
-                for j in range(5):
-                    angle = (pygame.time.get_ticks() * 0.01 + j * 72) % 360
-                    px = x + math.cos(math.radians(angle)) * 30
-                    py = y + math.sin(math.radians(angle)) * 30
-                    self.photonic.emit_photon_burst(px, py, 2, (255, 255, 100), 1)
+                angles = [(int(pygame.time.get_ticks() * 0.01) + j * 72) % 360 for j in range(5)]
+                self.photonic.emit_bulk([x + COS_TABLE[a] * 30 for a in angles],
+                                        [y + SIN_TABLE[a] * 30 for a in angles],
+                                        [2] * 5, [(255, 255, 100)] * 5, [1] * 5)
         
         # Mario icon on current level
         current_pos = node_positions[min(self.current_level - 1, len(node_positions) - 1)]
@@ -1087,55 +1535,79 @@ class SMB3Engine:
                         (current_pos[0] - 5, current_pos[1] - 25, 10, 15))
         
         # Update particles
-        for particle in self.photonic.particles[:]:
-            particle['pos'][0] += particle['vel'][0]
-            particle['pos'][1] += particle['vel'][1]
-            particle['life'] -= 3
-            
-            if particle['life'] <= 0:
-                self.photonic.particles.remove(particle)
-            else:
-                pygame.draw.circle(self.screen, tuple(particle['color']),
-                                 (int(particle['pos'][0]), int(particle['pos'][1])),
-                                 max(1, particle['life'] // 50))
+        photonic = self.photonic
+        photonic.update_particles(0.0, 3)  # No gravity on the map
+        n = photonic.n
+        xs = photonic.pos[:n, 0].astype(np.int32)
+        ys = photonic.pos[:n, 1].astype(np.int32)
+        visible = np.flatnonzero((xs > -6) & (xs < SCREEN_WIDTH + 6) & (ys > -6) & (ys < SCREEN_HEIGHT + 6))
+        if len(visible):
+            # One sprite per (color, radius), keyed as packed ints: rgb << 3 | radius
+            radii = np.maximum(1, photonic.life[visible] // 50).astype(np.int32)
+            rgb = photonic.color[visible].astype(np.int32)
+            keys = (rgb[:, 0] << 19) | (rgb[:, 1] << 11) | (rgb[:, 2] << 3) | radii
+            sprites = self._particle_sprites
+            self.screen.blits([
+                (sprites.get(key) or self._particle_sprite(key), (x, y))
+                for key, x, y in zip(keys.tolist(), (xs[visible] - radii).tolist(),
+                                     (ys[visible] - radii).tolist())
+            ], doreturn=False)
+    
+    def _particle_sprite(self, key):
+        """Colorkeyed filled-circle sprite for a packed (color, radius) key, built on first use"""
+        color = ((key >> 19) & 255, (key >> 11) & 255, (key >> 3) & 255)
+        radius = key & 7
+        transparent = (0, 0, 0) if color != (0, 0, 0) else (255, 0, 255)
+        sprite = pygame.Surface((2 * radius + 1, 2 * radius + 1)).convert()
+        sprite.fill(transparent)
+        sprite.set_colorkey(transparent, pygame.RLEACCEL)
+        pygame.draw.circle(sprite, color, (radius, radius), radius)
+        self._particle_sprites[key] = sprite
+        return sprite
     
     def _calculate_node_positions(self, num_nodes):
-        positions = []
-        rows = 3
-        cols = (num_nodes + rows - 1) // rows
-        
-        for i in range(num_nodes):
+        """Map node (x, y) positions on a 3-row grid; memoized by node count"""
+        positions = self._node_pos_cache.get(num_nodes)
+        if positions is None:
+            rows = 3
+            cols = max(1, (num_nodes + rows - 1) // rows)
+            i = np.arange(num_nodes)
             row = i // cols
-            col = i % cols
-            
-            x = 150 + col * 150
-            y = 200 + row * 120
+            x = 150 + (i % cols) * 150
             
             # Zigzag pattern for odd rows
-            if row % 2 == 1:
-                x = SCREEN_WIDTH - x
-            
-            positions.append((x, y))
-        
+            x = np.where(row % 2 == 1, SCREEN_WIDTH - x, x)
+            positions = [tuple(p) for p in np.stack([x, 200 + row * 120], 1).tolist()]
+            self._node_pos_cache[num_nodes] = positions
         return positions
     
+    def _text(self, text, color, font=None):
+        """Rendered text surface, cached by (text, color, font)"""
+        font = font or self.font_small
+        key = (text, color, font)
+        surf = self._text_cache.get(key)
+        if surf is None:
+            if len(self._text_cache) >= 256:
+                # Evict the oldest entry; dicts keep insertion order
+                del self._text_cache[next(iter(self._text_cache))]
+            surf = self._text_cache[key] = font.render(text, True, color).convert_alpha()
+        return surf
+    
     def render_hud(self):
         # Score
-        font = pygame.font.Font(None, 24)
-        score_text = font.render(f"SCORE: {self.score:07d}", True, (255, 255, 255))
+        score_text = self._text(f"SCORE: {self.score:07d}", (255, 255, 255))
         self.screen.blit(score_text, (10, 10))
         
         # Coins
-        coin_text = font.render(f"COINS: {self.coins:02d}", True, (255, 255, 0))
+        coin_text = self._text(f"COINS: {self.coins:02d}", (255, 255, 0))
         self.screen.blit(coin_text, (10, 35))
         
         # Lives
-        lives_text = font.render(f"LIVES: {self.lives}", True, (255, 255, 255))
+        lives_text = self._text(f"LIVES: {self.lives}", (255, 255, 255))
         self.screen.blit(lives_text, (10, 60))
         
         # World and Level
-        level_text = font.render(f"WORLD {self.current_world}-{self.current_level}", 
-                                True, (255, 255, 255))
+        level_text = self._text(f"WORLD {self.current_world}-{self.current_level}", (255, 255, 255))
         self.screen.blit(level_text, (SCREEN_WIDTH - 150, 10))
         
         # Power-up
@@ -1148,8 +1620,7 @@ class SMB3Engine:
             PowerUp.HAMMER: "HAMMER",
             PowerUp.FROG: "FROG"
         }
-        power_text = font.render(power_names.get(self.mario['power'], ""), 
-                                True, (255, 255, 255))
+        power_text = self._text(power_names.get(self.mario['power'], ""), (255, 255, 255))
         self.screen.blit(power_text, (SCREEN_WIDTH - 150, 35))
         
         # P-Meter
@@ -1182,7 +1653,7 @@ class SMB3Engine:
         
         # Update enemies
         if self.current_level_data:
-            for enemy in self.current_level_data.get('enemies', []):
+            for enemy in self.current_level_data.enemies:
                 self.update_enemy(enemy)
         
         # Update P-meter
@@ -1213,19 +1684,33 @@ class SMB3Engine:
         # Platform collision
         if self.current_level_data:
             self.mario['on_ground'] = False
-            mario_rect = pygame.Rect(self.mario['pos'][0], self.mario['pos'][1],
-                                    30, 40 if self.mario['power'] != PowerUp.SMALL else 30)
+            level = self.current_level_data
+            x, y = int(self.mario['pos'][0]), int(self.mario['pos'][1])
+            height = 40 if self.mario['power'] != PowerUp.SMALL else 30
+            xyxy = level.platforms_xyxy
+            rows = self._query_grid(level.platform_grid, x, x + 30)
             
-            for platform in self.current_level_data.get('platforms', []):
-                if platform['collision'] and mario_rect.colliderect(platform['rect']):
-                    if self.mario['vel'][1] > 0:  # Falling
-                        self.mario['pos'][1] = platform['rect'].top - mario_rect.height
-                        self.mario['vel'][1] = 0
-                        self.mario['on_ground'] = True
-                        
-                        # Apply ice physics
-                        if platform.get('friction'):
-                            self.mario['vel'][0] *= (1 - platform['friction'])
+            # Only the first overlapping solid platform can land Mario, since
+            # landing zeroes the fall speed for every later one
+            if self.use_numba:
+                hit = first_platform_hit(np.array((x, y, x + 30, y + height), np.int64),
+                                         xyxy, level.platforms_collision, rows)
+            else:
+                near = xyxy[rows]
+                hits = rows[level.platforms_collision[rows] &
+                            (x < near[:, 2]) & (x + 30 > near[:, 0]) &
+                            (y < near[:, 3]) & (y + height > near[:, 1])]
+                hit = hits[0] if hits.size else -1
+            
+            if hit >= 0 and self.mario['vel'][1] > 0:  # Falling
+                platform = level.platforms[hit]
+                self.mario['pos'][1] = platform.rect.top - height
+                self.mario['vel'][1] = 0
+                self.mario['on_ground'] = True
+                
+                # Apply ice physics
+                if platform.friction:
+                    self.mario['vel'][0] *= (1 - platform.friction)
     
     def update_enemy(self, enemy):
         # Basic enemy movement
@@ -1253,19 +1738,28 @@ class SMB3Engine:
         pass
     
     def handle_input(self, keys):
+        # Read each key once per frame
+        left = keys[pygame.K_LEFT]
+        right = keys[pygame.K_RIGHT]
+        
         if self.state == GameState.LEVEL:
+            run_key = keys[pygame.K_LSHIFT]
+            jump_key = keys[pygame.K_SPACE]
+            jump_pressed = jump_key and not self.mario['jump_held']
+            self.mario['jump_held'] = jump_key
+            
             # Left/Right movement
-            if keys[pygame.K_LEFT]:
-                self.mario['vel'][0] = -5 if not keys[pygame.K_LSHIFT] else -8
+            if left:
+                self.mario['vel'][0] = -5 if not run_key else -8
                 self.mario['facing_right'] = False
-            elif keys[pygame.K_RIGHT]:
-                self.mario['vel'][0] = 5 if not keys[pygame.K_LSHIFT] else 8
+            elif right:
+                self.mario['vel'][0] = 5 if not run_key else 8
                 self.mario['facing_right'] = True
             else:
                 self.mario['vel'][0] *= 0.9
             
-            # Jump
-            if keys[pygame.K_SPACE] and self.mario['on_ground']:
+            # Jump (once per press, so the burst below fires once too)
+            if jump_pressed and self.mario['on_ground']:
                 jump_power = -12
                 if self.mario['power'] == PowerUp.FROG:
                     jump_power = -15
@@ -1275,14 +1769,13 @@ class SMB3Engine:
                 self.mario['vel'][1] = jump_power
                 
                 # Jump particles
-                for i in range(10):
-                    self.photonic.emit_photon_burst(
-                        self.mario['pos'][0] + 15,
-                        self.mario['pos'][1] + 40,
-                        10, (255, 255, 100), 5
-                    )
+                self.photonic.emit_photon_burst(
+                    self.mario['pos'][0] + 15,
+                    self.mario['pos'][1] + 40,
+                    100, (255, 255, 100), 5
+                )
             
-            # Fire/Hammer/Tail attack
+            # Fire/Hammer/Tail attack (can_shoot/cooldown already limit the rate)
             if keys[pygame.K_LCTRL] and self.mario['can_shoot']:
                 if self.mario['power'] == PowerUp.FIRE:
                     self.shoot_fireball()
@@ -1302,10 +1795,10 @@ class SMB3Engine:
         
         elif self.state == GameState.WORLD_MAP:
             # Navigate world map
-            if keys[pygame.K_LEFT]:
+            if left:
                 self.current_level = max(1, self.current_level - 1)
-            elif keys[pygame.K_RIGHT]:
-                max_level = len(self.worlds[self.current_world]['levels'])
+            elif right:
+                max_level = len(self.worlds[self.current_world].levels)
                 self.current_level = min(max_level, self.current_level + 1)
             elif keys[pygame.K_RETURN]:
                 # Enter level
@@ -1341,6 +1834,12 @@ class SMB3Engine:
     
     def run(self):
         running = True
+        worker = UpdateWorker() if THREADED_UPDATE else None
+        profiler = cProfile.Profile() if PROFILE_RUN else None
+        if profiler:
+            profiler.enable()
+        if worker:
+            self.render_game()  # Prime the first frame; the loop presents before drawing
         
         while running:
             for event in pygame.event.get():
@@ -1365,11 +1864,24 @@ class SMB3Engine:
                         powers = list(PowerUp)
                         current_index = powers.index(self.mario['power'])
                         self.mario['power'] = powers[(current_index + 1) % len(powers)]
+                    
+                    # Debug: F3 switches between the numba kernels and the NumPy fallbacks
+                    if event.key == pygame.K_F3 and NUMBA_AVAILABLE:
+                        self.use_numba = self.photonic.use_numba = not self.use_numba
             
             # Handle continuous input
             keys = pygame.key.get_pressed()
             self.handle_input(keys)
             
+            if worker:
+                # Update the next frame on the worker while this one is shown
+                worker.submit(self.update)
+                pygame.display.flip()
+                self.clock.tick(FPS)
+                worker.wait()
+                self.render_game()
+                continue
+            
             # Update game state
             self.update()
             
@@ -1380,6 +1892,11 @@ class SMB3Engine:
             pygame.display.flip()
             self.clock.tick(FPS)
         
+        if profiler:
+            profiler.disable()
+            pstats.Stats(profiler).sort_stats('cumulative').print_stats(PROFILE_LINES)
+        if worker:
+            worker.close()
         pygame.quit()
 
 # ============= MAIN EXECUTION =============
@@ -1395,6 +1912,7 @@ if __name__ == "__main__":
     print("Ctrl - Fire/Attack")
     print("1-8 - Switch Worlds")
     print("P - Cycle Power-ups")
+    print("F3 - Toggle Numba Kernels")
     print("ESC - Toggle World Map/Level")
     print("Enter - Select Level (on World Map)")
     print("\n" + "=" * 60)